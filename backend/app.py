@@ -1,12 +1,30 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 import os
+import time
 
-from backend.db import Base, engine
-from backend.routers import datasets, experiments
-from backend import auth
+from backend.db import async_engine, async_read_engine
+from backend.routers import datasets, experiments, metrics
+from backend import auth, jobs, schema
+from backend.instrumentation import REQUEST_LATENCY
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tables come from Alembic (see backend/schema.py); refuse to serve against an outdated schema
+    await run_in_threadpool(schema.check)
+    yield
+    # Running experiments finish; ones still queued are cancelled and marked failed
+    jobs.shutdown(wait=False)
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = os.getenv("CORS_ORIGINS", "*").split(",")
 app.add_middleware(
@@ -17,8 +35,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Base.metadata.create_all(bind=engine)
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not the raw path, to keep the series count bounded
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            request.method, route.path if route else "unmatched", str(status)
+        ).observe(time.perf_counter() - start)
+
+
+@app.get("/ready", include_in_schema=False)
+def ready():
+    """Readiness probe: the database is reachable and at the migration head."""
+    try:
+        return {"status": "ready", "revision": schema.check()}
+    except (schema.SchemaNotReady, SQLAlchemyError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
 
 app.include_router(auth.router)
 app.include_router(datasets.router)
 app.include_router(experiments.router)
+app.include_router(metrics.router)
@@ -1,33 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
 from jose import jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import asyncio
 import os
 
 from backend import models, schemas
-from backend.deps import get_db
+from backend.db import get_async_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor (2^rounds iterations); existing hashes keep the cost they were made with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 JWT_SECRET = os.getenv("JWT_SECRET", "change-me")
 JWT_EXPIRE_MIN = int(os.getenv("JWT_EXPIRE_MIN", 30))
 
+# bcrypt is deliberately slow (~0.25 s at 12 rounds) and releases the GIL, so it
+# runs on its own small pool: a burst of logins queues there instead of blocking
+# the event loop or taking every thread that other requests need
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+
+async def _run_hash(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+
 
 @router.post("/register", response_model=schemas.UserOut)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    hashed_pw = pwd_context.hash(user.password)
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    hashed_pw = await _run_hash(pwd_context.hash, user.password)
     db_user = models.User(email=user.email, hashed_password=hashed_pw)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
 @router.post("/login")
-def login(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
-    if not db_user or not pwd_context.verify(user.password, db_user.hashed_password):
+async def login(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(models.User).where(models.User.email == user.email))
+    if not db_user:
+        # Same cost as a real check, so response time does not reveal which emails exist
+        await _run_hash(pwd_context.dummy_verify)
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not await _run_hash(pwd_context.verify, user.password, db_user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MIN)
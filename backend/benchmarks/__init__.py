@@ -0,0 +1,10 @@
+"""
+Benchmark scripts. Run them from the project root, for example:
+
+    python -m backend.benchmarks.run --output base.json
+    python -m backend.benchmarks.compare base.json new.json --threshold 0.2
+
+Each script writes JSON results (see common.write_results) that compare.py
+can diff. By default they use a throwaway SQLite database and blob directory;
+pass --database-url to benchmark against a local Postgres.
+"""
@@ -0,0 +1,124 @@
+# backend/benchmarks/auth.py
+"""
+Latency of an authenticated endpoint while other clients log in.
+
+    python -m backend.benchmarks.auth [--probes 200] [--logins 0,8,32]
+        [--bcrypt-rounds 12] [--repeat 3] [--output out.json]
+
+For each --logins level, that many clients log in back to back while one
+client sends --probes sequential GET /datasets/{id}/columns requests. The
+app runs in-process on one event loop (as under a single uvicorn worker), so
+anything that blocks the loop shows up in the probe tail. Each repeat records
+the p50 and p99 probe latency and the median login time.
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+
+from backend.benchmarks.common import add_common_args, setup_environment, synthetic_frame, result, write_results, log
+
+PROBE_PATH = "/datasets/{dataset_id}/columns"
+
+
+def _ints(text: str) -> list[int]:
+    return [int(v) for v in text.split(",") if v]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _prepare(client) -> tuple[dict, int, list[dict]]:
+    """Registers the prober and the login clients and uploads a small dataset."""
+    prober = {"email": "probe@example.com", "password": "bench-password"}
+    await client.post("/auth/register", json=prober)
+    token = (await client.post("/auth/login", json=prober)).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    buf = io.BytesIO()
+    synthetic_frame("regression", 1000, 10).to_csv(buf, index=False)
+    r = await client.post("/datasets/upload", files={"file": ("bench.csv", buf.getvalue(), "text/csv")}, headers=headers)
+    r.raise_for_status()
+    return headers, r.json()["dataset_id"], prober
+
+
+async def _login_loop(client, credentials: dict, stop: asyncio.Event, times: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.post("/auth/login", json=credentials)
+        r.raise_for_status()
+        times.append(time.perf_counter() - start)
+
+
+async def _round(client, headers, dataset_id, login_credentials, probes) -> tuple[list[float], list[float]]:
+    stop = asyncio.Event()
+    login_times: list[float] = []
+    loops = [asyncio.create_task(_login_loop(client, c, stop, login_times)) for c in login_credentials]
+    # Let the logins saturate the hash pool before probing
+    await asyncio.sleep(0.2 if loops else 0)
+
+    url = PROBE_PATH.format(dataset_id=dataset_id)
+    probe_times = []
+    try:
+        for _ in range(probes):
+            start = time.perf_counter()
+            r = await client.get(url, headers=headers)
+            r.raise_for_status()
+            probe_times.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+        await asyncio.gather(*loops)
+    return probe_times, login_times
+
+
+async def run(args) -> list[dict]:
+    import httpx
+    from backend.app import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers, dataset_id, _ = await _prepare(client)
+        results = []
+        for logins in _ints(args.logins):
+            credentials = [{"email": f"login{i}@example.com", "password": "bench-password"} for i in range(logins)]
+            for c in credentials:
+                await client.post("/auth/register", json=c)
+
+            log(f"logins={logins}")
+            p50s, p99s, login_medians = [], [], []
+            for _ in range(args.repeat):
+                probe_times, login_times = await _round(client, headers, dataset_id, credentials, args.probes)
+                p50s.append(statistics.median(probe_times))
+                p99s.append(_percentile(probe_times, 0.99))
+                if login_times:
+                    login_medians.append(statistics.median(login_times))
+
+            params = {"logins": logins, "probes": args.probes, "bcrypt_rounds": args.bcrypt_rounds}
+            results.append(result(f"auth/probe_p50 logins={logins}", p50s, **params))
+            results.append(result(f"auth/probe_p99 logins={logins}", p99s, **params))
+            if login_medians:
+                results.append(result(f"auth/login logins={logins}", login_medians, **params))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--probes", type=int, default=200, help="Authenticated requests per repeat")
+    parser.add_argument("--logins", default="0,8,32", help="Concurrent login clients, one measurement per value")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    # Read when backend.auth is imported
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    database_url = setup_environment(args)
+    results = asyncio.run(run(args))
+    write_results(results, args, suite="auth", database=database_url.split(":", 1)[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# backend/benchmarks/common.py
+"""
+Shared benchmark plumbing: environment setup, synthetic data, timing and the
+JSON result format.
+
+Results file:
+    {"meta": {...}, "results": [{"name", "params", "runs", "min", "median", "max"}]}
+`name` identifies a measurement across runs; times are seconds.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.dirname(BACKEND_DIR)
+
+
+def add_common_args(parser):
+    parser.add_argument("--database-url", help="Default: a fresh SQLite file in a temp directory")
+    parser.add_argument("--blob-dir", help="Default: a temp directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+
+
+def setup_environment(args) -> str:
+    """
+    Point the backend at the benchmark database and blob store and create the
+    schema if the database is new. Must run before anything imports backend.db.
+    """
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["BLOB_DIR"] = args.blob_dir or os.path.join(workdir, "blobs")
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+
+    from backend.db import engine
+    from backend import schema
+
+    # Statement logging would dominate the timings
+    engine.echo = False
+    # A fresh database gets the current schema; a given one must already be migrated
+    if schema.current_revision() is None:
+        schema.init()
+    schema.check()
+    return os.environ["DATABASE_URL"]
+
+
+def synthetic_frame(kind: str, rows: int, width: int, seed: int = 0) -> pd.DataFrame:
+    """
+    `width` feature columns, about a fifth of them categorical (10 levels),
+    plus the target: "y" (float) for regression, "label" (pos/neg) for
+    classification.
+    """
+    rng = np.random.default_rng(seed)
+    n_cat = max(1, width // 5)
+    n_num = max(1, width - n_cat)
+    data = {f"x{i}": rng.normal(size=rows) for i in range(n_num)}
+    for i in range(n_cat):
+        data[f"c{i}"] = rng.choice([f"level{j}" for j in range(10)], rows)
+    df = pd.DataFrame(data)
+    weights = rng.normal(size=n_num)
+    y = df[[f"x{i}" for i in range(n_num)]].to_numpy() @ weights + rng.normal(scale=0.5, size=rows)
+    y += (df["c0"] == "level0").to_numpy() * 2.0
+    if kind == "regression":
+        df["y"] = y
+    else:
+        df["label"] = np.where(y > np.median(y), "pos", "neg")
+    return df
+
+
+def target_of(kind: str) -> str:
+    return "y" if kind == "regression" else "label"
+
+
+def measure(fn, repeat: int, warmup: bool = False) -> list[float]:
+    """Wall times of `repeat` calls of fn()."""
+    if warmup:
+        fn()
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def result(name: str, runs: list[float], **params) -> dict:
+    return {
+        "name": name,
+        "params": params,
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "max": max(runs),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def write_results(results: list[dict], args, **meta):
+    doc = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            **meta,
+        },
+        "results": results,
+    }
+    text = json.dumps(doc, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+def log(message: str):
+    """Progress goes to stderr, so stdout stays valid JSON."""
+    print(message, file=sys.stderr, flush=True)
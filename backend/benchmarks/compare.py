@@ -0,0 +1,70 @@
+# backend/benchmarks/compare.py
+"""
+Compare two benchmark result files and flag regressions.
+
+    python -m backend.benchmarks.compare base.json new.json [--threshold 0.2] [--min-seconds 0.005]
+
+A measurement regresses when its median grows by more than `threshold`
+(0.2 = 20%). Measurements faster than --min-seconds in both runs are too noisy
+to judge and are only reported. Exits 1 if anything regressed.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict[str, dict]:
+    with open(path) as f:
+        return {r["name"]: r for r in json.load(f)["results"]}
+
+
+def compare(base: dict[str, dict], new: dict[str, dict], threshold: float, min_seconds: float) -> list[dict]:
+    rows = []
+    for name in sorted(base.keys() & new.keys()):
+        old_s, new_s = base[name]["median"], new[name]["median"]
+        change = (new_s - old_s) / old_s if old_s > 0 else 0.0
+        noisy = max(old_s, new_s) < min_seconds
+        if noisy:
+            verdict = "noise"
+        elif change > threshold:
+            verdict = "REGRESSION"
+        elif change < -threshold:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        rows.append({"name": name, "base": old_s, "new": new_s, "change": change, "verdict": verdict})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    args = parser.parse_args()
+
+    base, new = load(args.base), load(args.new)
+    rows = compare(base, new, args.threshold, args.min_seconds)
+    regressions = [r for r in rows if r["verdict"] == "REGRESSION"]
+
+    if args.json:
+        print(json.dumps({"rows": rows, "only_in_base": sorted(base.keys() - new.keys()),
+                          "only_in_new": sorted(new.keys() - base.keys())}, indent=2))
+    else:
+        width = max((len(r["name"]) for r in rows), default=10)
+        print(f"{'benchmark':<{width}}  {'base s':>10}  {'new s':>10}  {'change':>8}  verdict")
+        for r in rows:
+            print(f"{r['name']:<{width}}  {r['base']:>10.4f}  {r['new']:>10.4f}  {r['change']:>+8.1%}  {r['verdict']}")
+        for name in sorted(base.keys() - new.keys()):
+            print(f"{name:<{width}}  only in base")
+        for name in sorted(new.keys() - base.keys()):
+            print(f"{name:<{width}}  only in new")
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# backend/benchmarks/run.py
+"""
+End-to-end benchmark suite on synthetic data.
+
+    python -m backend.benchmarks.run [--suites ingest,info,train,plots,pdf,list]
+        [--rows 1000,10000] [--widths 10,50] [--train-max-rows 10000]
+        [--algorithms ridge,random_forest_classifier] [--list-size 10000]
+        [--database-url postgresql+psycopg://...] [--repeat 3] [--output out.json]
+
+Suites:
+  ingest  POST /datasets/upload of a CSV per (task, rows, width)
+  info    GET /datasets/{id}/info
+  train   train_pipeline() for every registry entry of the matching task
+  plots   every renderer and plot-data function in backend/ml/plots.py
+  pdf     report rendering, and a cached download through the API
+  list    GET /experiments over --list-size stored experiments
+"""
+import argparse
+import io
+import time
+
+import numpy as np
+
+from backend.benchmarks.common import (
+    add_common_args, setup_environment, synthetic_frame, target_of, measure, result, write_results, log,
+)
+
+SUITES = ("ingest", "info", "train", "plots", "pdf", "list")
+KINDS = ("regression", "classification")
+EXPERIMENT_TIMEOUT_SECONDS = 600
+
+
+def _ints(text: str) -> list[int]:
+    return [int(v) for v in text.split(",") if v]
+
+
+def _login(client) -> dict:
+    credentials = {"email": "bench@example.com", "password": "bench-password"}
+    client.post("/auth/register", json=credentials)
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _csv(df) -> bytes:
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def bench_ingest(client, headers, frames, repeat) -> tuple[list[dict], dict]:
+    """Upload every frame `repeat` times; returns the results and {frame key: last dataset id}."""
+    results, dataset_ids = [], {}
+    for (kind, rows, width), df in frames.items():
+        body = _csv(df)
+
+        def upload():
+            r = client.post("/datasets/upload", files={"file": ("bench.csv", body, "text/csv")}, headers=headers)
+            r.raise_for_status()
+            dataset_ids[(kind, rows, width)] = r.json()["dataset_id"]
+
+        runs = measure(upload, repeat)
+        results.append(result(f"ingest/{kind} rows={rows} width={width}", runs, rows=rows, width=width, bytes=len(body)))
+    return results, dataset_ids
+
+
+def bench_info(client, headers, dataset_ids, repeat) -> list[dict]:
+    results = []
+    for (kind, rows, width), dataset_id in dataset_ids.items():
+        runs = measure(lambda: client.get(f"/datasets/{dataset_id}/info", headers=headers).raise_for_status(), repeat)
+        results.append(result(f"info/{kind} rows={rows} width={width}", runs, rows=rows, width=width))
+    return results
+
+
+def bench_train(frames, algorithms, max_rows, repeat) -> list[dict]:
+    from backend.ml.pipeline import train_pipeline
+    from backend.ml.registry import ALGORITHMS, is_classification
+
+    results = []
+    for (kind, rows, width), df in frames.items():
+        if rows > max_rows:
+            continue
+        for algorithm in algorithms or ALGORITHMS:
+            if is_classification(algorithm) != (kind == "classification"):
+                continue
+            log(f"train {algorithm} rows={rows} width={width}")
+            runs = measure(lambda: train_pipeline(df, target_of(kind), algorithm=algorithm), repeat)
+            results.append(result(
+                f"train/{algorithm} rows={rows} width={width}", runs, algorithm=algorithm, rows=rows, width=width
+            ))
+    return results
+
+
+def bench_plots(sizes, repeat) -> list[dict]:
+    from backend.ml import plots
+
+    rng = np.random.default_rng(0)
+    results = []
+    for rows in sizes:
+        y_true = rng.normal(size=rows)
+        y_pred = y_true + rng.normal(scale=0.3, size=rows)
+        labels_true = np.where(y_true > 0, "pos", "neg")
+        labels_pred = np.where(y_pred > 0, "pos", "neg")
+        positive = labels_true == "pos"
+        cases = {
+            "residual_plot": lambda: plots.residual_plot(y_true, y_pred),
+            "predicted_vs_actual": lambda: plots.predicted_vs_actual(y_true, y_pred),
+            "confusion_matrix_plot": lambda: plots.confusion_matrix_plot(labels_true, labels_pred),
+            "roc_curve_plot": lambda: plots.roc_curve_plot(positive, y_pred, True),
+            "residual_histogram": lambda: plots.residual_histogram(y_true, y_pred),
+            "predicted_vs_actual_bins": lambda: plots.predicted_vs_actual_bins(y_true, y_pred),
+            "confusion_matrix_data": lambda: plots.confusion_matrix_data(labels_true, labels_pred),
+            "roc_curve_data": lambda: plots.roc_curve_data(positive, y_pred, True),
+        }
+        for name, fn in cases.items():
+            results.append(result(f"plots/{name} rows={rows}", measure(fn, repeat), rows=rows))
+    return results
+
+
+def _run_experiment(client, headers, dataset_id, kind) -> int:
+    algorithm = "linear_regression" if kind == "regression" else "logistic_regression"
+    r = client.post(
+        "/experiments/run",
+        json={"dataset_id": dataset_id, "target": target_of(kind), "algorithm": algorithm, "force": True},
+        headers=headers,
+    )
+    r.raise_for_status()
+    experiment_id = r.json()["experiment_id"]
+    deadline = time.monotonic() + EXPERIMENT_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        status = client.get(f"/experiments/{experiment_id}/status", headers=headers).json()["status"]
+        if status == "done":
+            return experiment_id
+        if status == "failed":
+            raise RuntimeError(f"Benchmark experiment {experiment_id} failed")
+        time.sleep(0.2)
+    raise TimeoutError(f"Benchmark experiment {experiment_id} did not finish")
+
+
+def bench_pdf(client, headers, dataset_ids, repeat) -> list[dict]:
+    from backend import reports
+    from backend.db import SessionLocal
+    from backend.models import Experiment
+
+    results = []
+    token = headers["Authorization"].split(" ")[1]
+    for (kind, rows, width), dataset_id in dataset_ids.items():
+        experiment_id = _run_experiment(client, headers, dataset_id, kind)
+        db = SessionLocal()
+        try:
+            exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+            # Renders the PNGs once, outside the timed section
+            plots = reports._plots(db, exp)
+            runs = measure(lambda: reports.write_report(exp, plots, io.BytesIO()), repeat)
+        finally:
+            db.close()
+        results.append(result(f"pdf/render {kind} rows={rows} width={width}", runs, rows=rows, width=width))
+
+        url = f"/experiments/{experiment_id}/download?token={token}"
+        runs = measure(lambda: client.get(url).raise_for_status(), repeat, warmup=True)
+        results.append(result(f"pdf/download_cached {kind} rows={rows} width={width}", runs, rows=rows, width=width))
+    return results
+
+
+def bench_list(client, headers, dataset_id, list_size, repeat) -> list[dict]:
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+    from backend.db import SessionLocal
+    from backend.models import Experiment, ExperimentMetric
+
+    log(f"inserting {list_size} experiments")
+    db = SessionLocal()
+    try:
+        start = datetime.utcnow() - timedelta(seconds=list_size)
+        ids = db.scalars(
+            insert(Experiment).returning(Experiment.id),
+            [
+                {"dataset_id": dataset_id, "created_at": start + timedelta(seconds=i), "target": "y",
+                 "algorithm": "ridge", "status": "done"}
+                for i in range(list_size)
+            ],
+        ).all()
+        db.execute(insert(ExperimentMetric), [
+            {"experiment_id": i, "metric_name": name, "metric_value": 0.5}
+            for i in ids for name in ("rmse", "r2")
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    results = [result(
+        f"list/first_page experiments={list_size}",
+        measure(lambda: client.get("/experiments?limit=50", headers=headers).raise_for_status(), repeat),
+        experiments=list_size,
+    )]
+
+    # Walk ten pages deep, then time fetching the page after that cursor
+    cursor = None
+    for _ in range(10):
+        page = client.get("/experiments", params={"limit": 50, "cursor": cursor}, headers=headers).json()
+        cursor = page["next_cursor"] or cursor
+    runs = measure(
+        lambda: client.get("/experiments", params={"limit": 50, "cursor": cursor}, headers=headers).raise_for_status(),
+        repeat,
+    )
+    results.append(result(f"list/deep_page experiments={list_size}", runs, experiments=list_size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--suites", default=",".join(SUITES))
+    parser.add_argument("--rows", default="1000,10000", help="Dataset sizes")
+    parser.add_argument("--widths", default="10,50", help="Feature column counts")
+    parser.add_argument("--train-max-rows", type=int, default=10_000, help="Skip larger sizes in the train suite")
+    parser.add_argument("--algorithms", help="Comma-separated registry names (default: all)")
+    parser.add_argument("--list-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    suites = [s for s in args.suites.split(",") if s]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+    sizes, widths = _ints(args.rows), _ints(args.widths)
+    algorithms = [a for a in (args.algorithms or "").split(",") if a]
+
+    database_url = setup_environment(args)
+    from fastapi.testclient import TestClient
+    from backend.app import app
+
+    frames = {
+        (kind, rows, width): synthetic_frame(kind, rows, width)
+        for kind in KINDS for rows in sizes for width in widths
+    }
+    results = []
+    with TestClient(app) as client:
+        headers = _login(client)
+        dataset_ids = {}
+        # info, pdf and list need uploaded datasets
+        if {"ingest", "info", "pdf", "list"} & set(suites):
+            log("ingest")
+            ingest, dataset_ids = bench_ingest(client, headers, frames, args.repeat if "ingest" in suites else 1)
+            if "ingest" in suites:
+                results += ingest
+        if "info" in suites:
+            log("info")
+            results += bench_info(client, headers, dataset_ids, args.repeat)
+        if "train" in suites:
+            results += bench_train(frames, algorithms, args.train_max_rows, args.repeat)
+        if "plots" in suites:
+            log("plots")
+            results += bench_plots(sizes, args.repeat)
+        if "pdf" in suites:
+            log("pdf")
+            results += bench_pdf(client, headers, dataset_ids, args.repeat)
+        if "list" in suites:
+            results += bench_list(client, headers, next(iter(dataset_ids.values())), args.list_size, args.repeat)
+
+    write_results(results, args, suite="run", database=database_url.split(":", 1)[0], rows=sizes, widths=widths)
+
+
+if __name__ == "__main__":
+    main()
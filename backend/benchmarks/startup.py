@@ -0,0 +1,86 @@
+# backend/benchmarks/startup.py
+"""
+Cold-start time of the API, with a budget.
+
+    python -m backend.benchmarks.startup [--repeat 5] [--import-budget 1.5]
+        [--forbid sklearn,matplotlib,reportlab,PIL,pandas,joblib] [--output out.json]
+
+Each repeat starts a fresh interpreter and measures:
+  import  `import backend.app`
+  ready   import, app startup (lifespan, including the schema check) and a
+          first GET /ready
+
+Exits 1 when the median import time exceeds --import-budget or when importing
+the app loaded any --forbid module (those belong on first use), so CI can run
+this as a check.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from backend.benchmarks.common import PROJECT_DIR, add_common_args, setup_environment, result, write_results, log
+
+DEFAULT_FORBIDDEN = "sklearn,matplotlib,reportlab,PIL,pandas,joblib"
+DEFAULT_IMPORT_BUDGET = 1.5   # seconds; also enforced by backend/tests/test_startup.py
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import backend.app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(backend.app.app) as client:
+    client.get("/ready").raise_for_status()
+ready = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "ready": ready - start,
+    "modules": sorted({name.split(".")[0] for name in sys.modules}),
+}))
+"""
+
+
+def _cold_start() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_args(parser)
+    parser.add_argument("--import-budget", type=float, default=DEFAULT_IMPORT_BUDGET, help="Seconds, median of the repeats")
+    parser.add_argument("--forbid", default=DEFAULT_FORBIDDEN, help="Top-level modules `import backend.app` must not load")
+    parser.set_defaults(repeat=5)
+    args = parser.parse_args()
+
+    database_url = setup_environment(args)
+    runs = []
+    for i in range(args.repeat):
+        log(f"cold start {i + 1}/{args.repeat}")
+        runs.append(_cold_start())
+
+    results = [
+        result("startup/import", [r["import"] for r in runs]),
+        result("startup/ready", [r["ready"] for r in runs]),
+    ]
+    write_results(results, args, suite="startup", database=database_url.split(":", 1)[0])
+
+    failures = []
+    median_import = statistics.median(r["import"] for r in runs)
+    if median_import > args.import_budget:
+        failures.append(f"import took {median_import:.3f}s, budget {args.import_budget:.3f}s")
+    forbidden = {m for m in args.forbid.split(",") if m}
+    loaded = sorted(forbidden.intersection(*(r["modules"] for r in runs)))
+    if loaded:
+        failures.append(f"import loaded {', '.join(loaded)}")
+    for failure in failures:
+        log(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# backend/blobstore.py
+"""
+Content-addressed blob store for dataset files and experiment artifacts.
+
+Blobs are keyed by the SHA-256 of their content, so identical uploads and
+identical plots are stored once. Database rows keep only the key and size.
+
+Backends:
+  * local (default): files under BLOB_DIR, served zero-copy with FileResponse
+  * s3: any S3-compatible service (BLOB_S3_BUCKET, BLOB_S3_ENDPOINT), with a
+    local read-through cache under BLOB_CACHE_DIR so reads are still file-backed
+"""
+import io
+import os
+import hashlib
+import tempfile
+import threading
+from typing import BinaryIO
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_to_temp(src: BinaryIO, tmp_dir: str) -> tuple[str, int, str]:
+    """Copy `src` into a temp file while hashing it. Returns (key, size, temp path)."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    with os.fdopen(fd, "wb") as out:
+        while chunk := src.read(CHUNK_SIZE):
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size, tmp_path
+
+
+class BlobStore:
+    """Interface shared by the storage backends."""
+
+    def put_file(self, src: BinaryIO) -> tuple[str, int]:
+        """Store the stream's content; returns (key, size). Existing content is not rewritten."""
+        raise NotImplementedError
+
+    def put_bytes(self, data: bytes) -> tuple[str, int]:
+        key = hashlib.sha256(data).hexdigest()
+        if not self.exists(key):
+            self.put_file(io.BytesIO(data))
+        return key, len(data)
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def path(self, key: str) -> str:
+        """A local filesystem path holding the blob, for FileResponse and memory-mapped reads."""
+        raise NotImplementedError
+
+    def read_bytes(self, key: str) -> bytes:
+        with open(self.path(key), "rb") as f:
+            return f.read()
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = root
+        self._tmp = os.path.join(root, "tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def put_file(self, src: BinaryIO) -> tuple[str, int]:
+        key, size, tmp_path = _hash_to_temp(src, self._tmp)
+        final = self.path(key)
+        if os.path.exists(final):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(tmp_path, final)   # atomic, so readers never see a partial blob
+        return key, size
+
+
+class S3BlobStore(BlobStore):
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str | None = None, cache_dir: str | None = None):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("BLOB_STORE=s3 requires the boto3 package") from e
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cache = LocalBlobStore(cache_dir or os.path.join(tempfile.gettempdir(), "blob-cache"))
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key}"
+
+    def _exists_remote(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except self.client.exceptions.ClientError:
+            return False
+
+    def exists(self, key: str) -> bool:
+        return self.cache.exists(key) or self._exists_remote(key)
+
+    def put_file(self, src: BinaryIO) -> tuple[str, int]:
+        # Stage (and hash) through the local cache, then upload only new content
+        key, size = self.cache.put_file(src)
+        if not self._exists_remote(key):
+            self.client.upload_file(self.cache.path(key), self.bucket, self._object_key(key))
+        return key, size
+
+    def path(self, key: str) -> str:
+        if not self.cache.exists(key):
+            with tempfile.TemporaryFile(dir=self.cache._tmp) as tmp:
+                self.client.download_fileobj(self.bucket, self._object_key(key), tmp)
+                tmp.seek(0)
+                self.cache.put_file(tmp)
+        return self.cache.path(key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            backend = os.getenv("BLOB_STORE", "local")
+            if backend == "s3":
+                _store = S3BlobStore(
+                    bucket=os.environ["BLOB_S3_BUCKET"],
+                    prefix=os.getenv("BLOB_S3_PREFIX", ""),
+                    endpoint_url=os.getenv("BLOB_S3_ENDPOINT"),
+                    cache_dir=os.getenv("BLOB_CACHE_DIR"),
+                )
+            elif backend == "local":
+                _store = LocalBlobStore(os.getenv("BLOB_DIR", os.path.join(BASE_DIR, "blobs")))
+            else:
+                raise ValueError(f"Unknown BLOB_STORE '{backend}'")
+        return _store
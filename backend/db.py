@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Load env vars from the project root .env (one level above backend/)
@@ -11,13 +12,46 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in .env")
 
+# Engine settings; the pool settings apply per process (API server and each job worker)
+SQL_ECHO = os.getenv("SQL_ECHO", "").lower() in ("1", "true", "yes")   # log every statement
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+# Server-side limit per statement, in ms (PostgreSQL only; 0 = none)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+# Optional read replica for read-only endpoints; see get_read_db()
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+# Async drivers for the same databases, used by the `async def` endpoints
+ASYNC_DRIVERS = {"postgresql": "postgresql+psycopg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_url(url: str):
+    """The async-driver form of a database URL (psycopg 3 serves both modes under one name)."""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername))
+
+
+def engine_options(url: str) -> dict:
+    """create_engine() / create_async_engine() keyword arguments for `url` from the settings above."""
+    parsed = make_url(url)
+    options = dict(
+        echo=SQL_ECHO,
+        pool_pre_ping=True,                       # auto check if connection is alive
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,     # replace connections older than this
+    )
+    # In-memory SQLite keeps one connection per thread; there is no pool to size
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT_SECONDS)
+    if DB_STATEMENT_TIMEOUT_MS and parsed.get_backend_name() == "postgresql":
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,               # log SQL queries (turn off in production)
-    pool_pre_ping=True,      # auto check if connection is alive
-    pool_recycle=1800        # recycle connections every 30 min
-)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 
 # Session factory
 SessionLocal = sessionmaker(
@@ -26,13 +60,61 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+async_engine = create_async_engine(async_url(DATABASE_URL), **engine_options(DATABASE_URL))
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,   # rows stay readable after commit without another round trip
+)
+
+# Without a replica, reads share the primary engines
+if DATABASE_READ_URL:
+    read_engine = create_engine(DATABASE_READ_URL, **engine_options(DATABASE_READ_URL))
+    async_read_engine = create_async_engine(async_url(DATABASE_READ_URL), **engine_options(DATABASE_READ_URL))
+else:
+    read_engine, async_read_engine = engine, async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+def forget_inherited_connections():
+    """In a forked child: drop the parent's pooled connections (without closing them) on every engine."""
+    for e in {engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine}:
+        e.dispose(close=False)
+
+
 # Base class for models
 Base = declarative_base()
 
-# Dependency for FastAPI routes
+
+# Dependencies for FastAPI routes: `def` endpoints (run in the threadpool) use
+# get_db, `async def` endpoints use get_async_db so they never block the event loop
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Read-only endpoints use these. With DATABASE_READ_URL set they read from the
+# replica and may lag the primary by its replication delay, so anything that
+# must see a write it just made (status polling, enqueue checks) stays on get_db.
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,30 +1,87 @@
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, Header
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 import os
+import threading
+import time
 
-from backend.db import SessionLocal
+from backend.db import get_db, get_async_db, get_read_db
 from backend import models
 
 # Secret + algorithm
 JWT_SECRET = os.getenv("JWT_SECRET", "change-me")
 JWT_ALGORITHM = "HS256"
 
+# How long a resolved user is trusted without another users lookup (0 disables)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 60))
+AUTH_CACHE_MAX_USERS = int(os.getenv("AUTH_CACHE_MAX_USERS", 10_000))
 
-# --- Database Session Dependency ---
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as endpoints see it; detached from any session, so it can be cached."""
+    id: int
+    email: str
 
-# --- Auth Dependency ---
-def get_current_user(
-    authorization: str = Header(..., description="Bearer <token>"),
-    db: Session = Depends(get_db),
-):
+
+class PrincipalCache:
+    """
+    Short-TTL map of user id -> Principal, so a valid token costs no query.
+
+    Entries are dropped when the user row is updated or deleted in this process
+    (see the mapper events below); other processes see the change within the TTL.
+    """
+
+    def __init__(self, ttl: float, max_users: int):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries: dict[int, tuple[float, Principal]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, principal: Principal):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_users:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_users:
+                    self._entries.clear()
+            self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_USERS)
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate(target.id)
+
+
+def _token_user_id(authorization: str) -> int:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
 
@@ -32,16 +89,35 @@ def get_current_user(
 
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    return int(user_id)
 
-        # Fetch user from DB
-        user = db.query(models.User).filter(models.User.id == int(user_id)).first()
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
 
-        return user
+def _remember(user) -> Principal:
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    principal = Principal(id=user.id, email=user.email)
+    principal_cache.put(principal)
+    return principal
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+# --- Auth Dependency ---
+def get_current_user(
+    authorization: str = Header(..., description="Bearer <token>"),
+    db: Session = Depends(get_db),
+) -> Principal:
+    user_id = _token_user_id(authorization)
+    return principal_cache.get(user_id) or _remember(db.get(models.User, user_id))
+
+
+async def get_current_user_async(
+    authorization: str = Header(..., description="Bearer <token>"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """get_current_user() for `async def` endpoints."""
+    user_id = _token_user_id(authorization)
+    return principal_cache.get(user_id) or _remember(await db.get(models.User, user_id))
@@ -0,0 +1,124 @@
+# backend/instrumentation.py
+"""
+Run tracing and Prometheus metrics.
+
+Stage timing: a job opens trace(), and code on its path wraps work in
+stage("fit") and the like. Outside a trace, stage() does nothing, so library
+code can be instrumented unconditionally. The durations are stored as
+experiment metric rows under TIMING_PREFIX ("timing.fit" in seconds,
+"timing.peak_rss_mb"), which the API keeps apart from the model metrics. The
+peak is per job where the kernel lets a process reset its high-water mark
+(Linux); elsewhere it is stored as "timing.worker_peak_rss_mb", the pool
+worker's peak over every job it has run.
+
+Prometheus: REGISTRY holds this process's metrics and is served at /metrics
+(see backend/routers/metrics.py). Training runs in the job pool's worker
+processes, so per-run numbers live in the timing rows, not here.
+"""
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import CollectorRegistry, Histogram
+
+TIMING_PREFIX = "timing."
+
+REGISTRY = CollectorRegistry()
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    registry=REGISTRY,
+)
+PLOT_RENDER_SECONDS = Histogram(
+    "plot_render_seconds",
+    "Time to render one plot artifact",
+    ["plot"],
+    registry=REGISTRY,
+)
+
+
+class StageTimer:
+    """Wall time per named stage; a stage entered more than once accumulates."""
+
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+    def metrics(self) -> dict[str, float]:
+        return {f"{TIMING_PREFIX}{name}": seconds for name, seconds in self.durations.items()}
+
+
+_current: ContextVar[StageTimer | None] = ContextVar("stage_timer", default=None)
+
+
+@contextmanager
+def trace():
+    """Collect the stage() timings of this block (in this thread or task) into a new StageTimer."""
+    timer = StageTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+
+def reset_peak_rss() -> bool:
+    """Start a new high-water mark for peak_rss_mb(); False where this is not supported."""
+    try:
+        # "5" resets VmHWM to the current RSS (Linux 4.0+)
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident memory since reset_peak_rss() (or its start), in MiB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # No reset here: the lifetime peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def is_timing(metric_name: str) -> bool:
+    return metric_name.startswith(TIMING_PREFIX)
+
+
+def split_metrics(metrics) -> tuple[dict, dict]:
+    """ExperimentMetric rows -> ({model metrics}, {timings without the prefix})."""
+    values, timings = {}, {}
+    for m in metrics:
+        if is_timing(m.metric_name):
+            timings[m.metric_name[len(TIMING_PREFIX):]] = m.metric_value
+        else:
+            values[m.metric_name] = m.metric_value
+    return values, timings
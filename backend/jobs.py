@@ -0,0 +1,107 @@
+# backend/jobs.py
+"""
+Experiment job queue.
+
+`/experiments/run` only creates a queued Experiment row and hands its id to a
+process pool. The worker process loads the dataset, trains and writes the
+results (backend/worker.py), moving `Experiment.status` through
+queued -> running -> done | failed. `/experiments/compare` queues a whole
+group of experiments as a single job that reads and preprocesses the data once.
+"""
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.db import SessionLocal, forget_inherited_connections
+from backend.models import Experiment
+
+logger = logging.getLogger(__name__)
+
+EXPERIMENT_WORKERS = int(os.getenv("EXPERIMENT_WORKERS", os.cpu_count() or 2))
+
+TERMINAL_STATUSES = {"done", "failed"}
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+
+
+def _init_worker():
+    # Connections inherited from the parent process must not be reused here
+    forget_inherited_connections()
+    # The training stack is only ever loaded in the workers; do it before the first job arrives
+    import backend.worker  # noqa: F401
+
+
+def _run_in_worker(name: str, *args):
+    from backend import worker
+    return getattr(worker, name)(*args)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=EXPERIMENT_WORKERS, initializer=_init_worker)
+        return _executor
+
+
+def queue_depth() -> int:
+    """Number of experiments submitted to the pool that have not finished yet."""
+    return _pending
+
+
+def submit_experiment(experiment_id: int):
+    return _submit([experiment_id], "run_experiment_job", experiment_id)
+
+
+def submit_compare(experiment_ids: list[int]):
+    """Queue a compare group as one job, so the dataset is loaded once for all of it."""
+    return _submit(experiment_ids, "run_compare_job", experiment_ids)
+
+
+def _submit(experiment_ids: list[int], job: str, *args):
+    """Queue backend.worker.<job>(*args); it is named, not passed, so this process never imports it."""
+    global _pending
+    with _executor_lock:
+        _pending += 1
+    future = get_executor().submit(_run_in_worker, job, *args)
+    future.add_done_callback(lambda f: _on_job_done(experiment_ids, f))
+    return future
+
+
+def _on_job_done(experiment_ids: list[int], future):
+    global _pending
+    with _executor_lock:
+        _pending -= 1
+    if future.cancelled():
+        for experiment_id in experiment_ids:
+            _mark_failed(experiment_id, "Cancelled before it started (server shutdown)")
+        return
+    exc = future.exception()
+    if exc is not None:
+        # The worker died before it could record the failure itself (e.g. BrokenProcessPool)
+        logger.error("Experiment(s) %s crashed: %s", experiment_ids, exc)
+        for experiment_id in experiment_ids:
+            _mark_failed(experiment_id, str(exc) or exc.__class__.__name__)
+
+
+def _mark_failed(experiment_id: int, message: str):
+    db = SessionLocal()
+    try:
+        exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        if exp and exp.status not in TERMINAL_STATUSES:
+            exp.status = "failed"
+            exp.error = message
+            db.commit()
+    finally:
+        db.close()
+
+
+def shutdown(wait: bool = True):
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=not wait)
+            _executor = None
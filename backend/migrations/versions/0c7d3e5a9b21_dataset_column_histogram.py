@@ -0,0 +1,29 @@
+"""dataset column histogram
+
+Revision ID: 0c7d3e5a9b21
+Revises: f6a2c9e4d1b3
+Create Date: 2026-10-18 19:20:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7d3e5a9b21'
+down_revision: Union[str, Sequence[str], None] = 'f6a2c9e4d1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing datasets get theirs on first request (routers/datasets.py)
+    op.add_column('dataset_columns', sa.Column('histogram', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('dataset_columns', 'histogram')
@@ -0,0 +1,30 @@
+"""experiment job fields
+
+Revision ID: 3f1c2a9d7b40
+Revises: 5eec91571aa5
+Create Date: 2026-10-18 09:12:04.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b40'
+down_revision: Union[str, Sequence[str], None] = '5eec91571aa5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('experiments', sa.Column('split', sa.Float(), nullable=True))
+    op.add_column('experiments', sa.Column('error', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('experiments', 'error')
+    op.drop_column('experiments', 'split')
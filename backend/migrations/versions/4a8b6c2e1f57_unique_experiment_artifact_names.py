@@ -0,0 +1,32 @@
+"""unique experiment artifact names
+
+Revision ID: 4a8b6c2e1f57
+Revises: 0c7d3e5a9b21
+Create Date: 2026-10-18 21:05:12.384920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a8b6c2e1f57'
+down_revision: Union[str, Sequence[str], None] = '0c7d3e5a9b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent renders may already have stored a name twice; keep the first row
+    op.execute(
+        "DELETE FROM experiment_artifacts WHERE id NOT IN "
+        "(SELECT MIN(id) FROM experiment_artifacts GROUP BY experiment_id, artifact_path)"
+    )
+    op.create_index('uq_experiment_artifacts_experiment_path', 'experiment_artifacts', ['experiment_id', 'artifact_path'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_experiment_artifacts_experiment_path', table_name='experiment_artifacts')
@@ -0,0 +1,35 @@
+"""experiment list indexes
+
+Revision ID: 7b0e4d2a9c61
+Revises: e2b5d8c0f914
+Create Date: 2026-10-18 13:55:41.206377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b0e4d2a9c61'
+down_revision: Union[str, Sequence[str], None] = 'e2b5d8c0f914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_datasets_user_id'), 'datasets', ['user_id'], unique=False)
+    op.create_index('ix_experiments_created_at_id', 'experiments', ['created_at', 'id'], unique=False)
+    op.create_index('ix_experiments_dataset_created_at_id', 'experiments', ['dataset_id', 'created_at', 'id'], unique=False)
+    op.create_index(op.f('ix_experiment_metrics_experiment_id'), 'experiment_metrics', ['experiment_id'], unique=False)
+    op.create_index(op.f('ix_experiment_artifacts_experiment_id'), 'experiment_artifacts', ['experiment_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_experiment_artifacts_experiment_id'), table_name='experiment_artifacts')
+    op.drop_index(op.f('ix_experiment_metrics_experiment_id'), table_name='experiment_metrics')
+    op.drop_index('ix_experiments_dataset_created_at_id', table_name='experiments')
+    op.drop_index('ix_experiments_created_at_id', table_name='experiments')
+    op.drop_index(op.f('ix_datasets_user_id'), table_name='datasets')
@@ -0,0 +1,28 @@
+"""experiment params
+
+Revision ID: 91d6a3f0e7b8
+Revises: 7b0e4d2a9c61
+Create Date: 2026-10-18 15:08:22.671940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91d6a3f0e7b8'
+down_revision: Union[str, Sequence[str], None] = '7b0e4d2a9c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('experiments', sa.Column('params', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('experiments', 'params')
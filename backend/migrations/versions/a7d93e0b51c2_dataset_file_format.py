@@ -0,0 +1,28 @@
+"""dataset file format
+
+Revision ID: a7d93e0b51c2
+Revises: 3f1c2a9d7b40
+Create Date: 2026-10-18 10:02:37.540911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d93e0b51c2'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('dataset_files', sa.Column('format', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('dataset_files', 'format')
@@ -0,0 +1,30 @@
+"""experiment search mode
+
+Revision ID: b38e1f6c5a07
+Revises: d05f7c3b8e29
+Create Date: 2026-10-18 16:22:41.905117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b38e1f6c5a07'
+down_revision: Union[str, Sequence[str], None] = 'd05f7c3b8e29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('experiments', sa.Column('mode', sa.String(), nullable=True))
+    op.add_column('experiments', sa.Column('search', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('experiments', 'search')
+    op.drop_column('experiments', 'mode')
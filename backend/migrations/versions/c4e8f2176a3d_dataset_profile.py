@@ -0,0 +1,47 @@
+"""dataset profile
+
+Revision ID: c4e8f2176a3d
+Revises: a7d93e0b51c2
+Create Date: 2026-10-18 11:26:50.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8f2176a3d'
+down_revision: Union[str, Sequence[str], None] = 'a7d93e0b51c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('datasets', sa.Column('row_count', sa.Integer(), nullable=True))
+    op.create_table('dataset_columns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dataset_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('dtype', sa.String(), nullable=False),
+    sa.Column('null_count', sa.Integer(), nullable=True),
+    sa.Column('distinct_count', sa.Integer(), nullable=True),
+    sa.Column('min_value', sa.Float(), nullable=True),
+    sa.Column('max_value', sa.Float(), nullable=True),
+    sa.Column('mean', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['dataset_id'], ['datasets.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_dataset_columns_id'), 'dataset_columns', ['id'], unique=False)
+    op.create_index(op.f('ix_dataset_columns_dataset_id'), 'dataset_columns', ['dataset_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_dataset_columns_dataset_id'), table_name='dataset_columns')
+    op.drop_index(op.f('ix_dataset_columns_id'), table_name='dataset_columns')
+    op.drop_table('dataset_columns')
+    op.drop_column('datasets', 'row_count')
@@ -0,0 +1,30 @@
+"""experiment cache key
+
+Revision ID: d05f7c3b8e29
+Revises: 91d6a3f0e7b8
+Create Date: 2026-10-18 15:47:09.384551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd05f7c3b8e29'
+down_revision: Union[str, Sequence[str], None] = '91d6a3f0e7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('experiments', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_experiments_cache_key'), 'experiments', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_experiments_cache_key'), table_name='experiments')
+    op.drop_column('experiments', 'cache_key')
@@ -0,0 +1,40 @@
+"""blob store keys
+
+Revision ID: e2b5d8c0f914
+Revises: c4e8f2176a3d
+Create Date: 2026-10-18 12:40:13.337801
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b5d8c0f914'
+down_revision: Union[str, Sequence[str], None] = 'c4e8f2176a3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('dataset_files', sa.Column('blob_key', sa.String(length=64), nullable=True))
+    op.add_column('dataset_files', sa.Column('size', sa.BigInteger(), nullable=True))
+    op.alter_column('dataset_files', 'data',
+               existing_type=sa.LargeBinary(),
+               nullable=True)
+    op.add_column('experiment_artifacts', sa.Column('blob_key', sa.String(length=64), nullable=True))
+    op.add_column('experiment_artifacts', sa.Column('size', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('experiment_artifacts', 'size')
+    op.drop_column('experiment_artifacts', 'blob_key')
+    op.alter_column('dataset_files', 'data',
+               existing_type=sa.LargeBinary(),
+               nullable=False)
+    op.drop_column('dataset_files', 'size')
+    op.drop_column('dataset_files', 'blob_key')
@@ -0,0 +1,30 @@
+"""experiment run group
+
+Revision ID: f6a2c9e4d1b3
+Revises: b38e1f6c5a07
+Create Date: 2026-10-18 16:58:13.270448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a2c9e4d1b3'
+down_revision: Union[str, Sequence[str], None] = 'b38e1f6c5a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('experiments', sa.Column('run_group', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_experiments_run_group'), 'experiments', ['run_group'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_experiments_run_group'), table_name='experiments')
+    op.drop_column('experiments', 'run_group')
@@ -1,46 +1,102 @@
 # backend/ml/classification_algorithms.py
 
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC
-from sklearn.neighbors import KNeighborsClassifier
-
+# Entry format: see backend/ml/registry.py
 CLASSIFICATION_ALGORITHMS = {
     "logistic_regression": {
         "type": "classification",
         "description": "Predicts probability of a binary class using a logistic function.",
         "best_for": "Binary classification datasets (yes/no, spam/ham, etc.).",
-        "model": LogisticRegression(max_iter=1000),
+        "estimator": "sklearn.linear_model.LogisticRegression",
+        "params": {"max_iter": 1000},
+        "streaming": {"algorithm": "sgd_classifier"},
+        "search_space": {"C": [0.01, 0.1, 1.0, 10.0, 100.0]},
     },
     "random_forest_classifier": {
         "type": "classification",
         "description": "Ensemble of trees for multi-class classification.",
         "best_for": "Categorical targets with many classes or noisy data.",
-        "model": RandomForestClassifier(),
+        "estimator": "sklearn.ensemble.RandomForestClassifier",
+        "params": {"random_state": 42},
+        "max_rows": 1_000_000,
+        "search_space": {
+            "n_estimators": [100, 200, 400],
+            "max_depth": [None, 10, 20],
+            "min_samples_leaf": [1, 2, 5],
+            "max_features": ["sqrt", 1.0],
+        },
+        "parallel": True,
     },
     "gradient_boosting_classifier": {
         "type": "classification",
         "description": "Boosting method for classification tasks that focuses on hard-to-classify samples.",
         "best_for": "Complex classification problems where accuracy is critical.",
-        "model": GradientBoostingClassifier(),
+        "estimator": "sklearn.ensemble.GradientBoostingClassifier",
+        "params": {"random_state": 42},
+        "large_data": {"algorithm": "hist_gradient_boosting_classifier"},
+        "search_space": {
+            "n_estimators": [100, 200, 400],
+            "learning_rate": [0.03, 0.1, 0.3],
+            "max_depth": [2, 3, 5],
+            "subsample": [0.8, 1.0],
+        },
     },
     "decision_tree_classifier": {
         "type": "classification",
         "description": "Single decision tree model for classification tasks.",
         "best_for": "Small datasets or when model interpretability is key.",
-        "model": DecisionTreeClassifier(),
+        "estimator": "sklearn.tree.DecisionTreeClassifier",
+        "params": {"random_state": 42},
+        "search_space": {"max_depth": [None, 5, 10, 20], "min_samples_leaf": [1, 5, 20]},
     },
     "svm_classifier": {
         "type": "classification",
         "description": "Finds best hyperplane to separate classes in feature space.",
         "best_for": "Small/medium datasets with clear class boundaries.",
-        "model": SVC(probability=True),
+        "estimator": "sklearn.svm.SVC",
+        "params": {"probability": True, "random_state": 42},
+        "large_data": {"algorithm": "linear_svm_classifier"},
+        "max_rows": 50_000,   # kernel SVC is O(n^2) or worse
+        "search_space": {"C": [0.1, 1.0, 10.0, 100.0], "gamma": ["scale", 0.01, 0.1, 1.0]},
+        "float32": False,   # libsvm converts to float64 anyway
     },
     "knn_classifier": {
         "type": "classification",
         "description": "Predicts class based on the majority of nearest neighbors.",
         "best_for": "Small datasets where decision boundaries are irregular.",
-        "model": KNeighborsClassifier(),
-    }
+        "estimator": "sklearn.neighbors.KNeighborsClassifier",
+        "params": {},
+        "max_rows": 100_000,   # every prediction scans the training set
+        "search_space": {"n_neighbors": [3, 5, 11, 21], "weights": ["uniform", "distance"]},
+        "parallel": True,
+    },
+    "hist_gradient_boosting_classifier": {
+        "type": "classification",
+        "description": "Gradient boosting on binned features; much faster than classic boosting on large data.",
+        "best_for": "Large tabular datasets (hundreds of thousands of rows and up).",
+        "estimator": "sklearn.ensemble.HistGradientBoostingClassifier",
+        "params": {"random_state": 42},
+        "search_space": {
+            "learning_rate": [0.03, 0.1, 0.3],
+            "max_leaf_nodes": [15, 31, 63],
+            "l2_regularization": [0.0, 0.1, 1.0],
+        },
+        "sparse": False,
+    },
+    "linear_svm_classifier": {
+        "type": "classification",
+        "description": "Linear support vector machine with calibrated class probabilities.",
+        "best_for": "Large or wide datasets where a kernel SVM is too slow.",
+        "estimator": "backend.ml.estimators.CalibratedLinearSVC",
+        "params": {"random_state": 42},
+        "search_space": {"C": [0.01, 0.1, 1.0, 10.0]},
+    },
+    "sgd_classifier": {
+        "type": "classification",
+        "description": "Logistic regression fitted by stochastic gradient descent, one batch at a time.",
+        "best_for": "Very large datasets with mostly linear class boundaries.",
+        "estimator": "sklearn.linear_model.SGDClassifier",
+        "params": {"loss": "log_loss", "random_state": 42},
+        "search_space": {"alpha": [0.00001, 0.0001, 0.001], "penalty": ["l2", "l1", "elasticnet"]},
+        "incremental": True,
+    },
 }
@@ -0,0 +1,26 @@
+# backend/ml/estimators.py
+"""Estimators of our own, referenced from the registries by dotted path."""
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.svm import LinearSVC
+
+
+class CalibratedLinearSVC(ClassifierMixin, BaseEstimator):
+    """LinearSVC with sigmoid-calibrated probabilities: a linear-time stand-in for SVC(probability=True)."""
+
+    def __init__(self, C=1.0, cv=3, random_state=None):
+        self.C = C
+        self.cv = cv
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        svc = LinearSVC(C=self.C, random_state=self.random_state)
+        self.calibrated_ = CalibratedClassifierCV(svc, cv=self.cv).fit(X, y)
+        self.classes_ = self.calibrated_.classes_
+        return self
+
+    def predict(self, X):
+        return self.calibrated_.predict(X)
+
+    def predict_proba(self, X):
+        return self.calibrated_.predict_proba(X)
@@ -0,0 +1,66 @@
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from backend.blobstore import get_blob_store
+
+MODEL_ARTIFACT = "model.joblib"
+MODEL_CACHE_MB = int(os.getenv("MODEL_CACHE_MB", 512))
+
+
+def serialize_model(pipeline) -> bytes:
+    import joblib
+
+    buf = io.BytesIO()
+    joblib.dump(pipeline, buf, compress=3)
+    return buf.getvalue()
+
+
+class ModelCache:
+    """
+    LRU cache of deserialized model pipelines, bounded by estimated memory.
+
+    Keys are blob-store keys, which are content hashes, so entries never go stale.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def size_bytes(self) -> int:
+        return self._total
+
+    def get(self, blob_key: str):
+        with self._lock:
+            entry = self._entries.get(blob_key)
+            if entry is not None:
+                self._entries.move_to_end(blob_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Deserialize outside the lock; a concurrent miss on the same key just loads twice.
+        # joblib (and the model's own sklearn modules) load with the first model.
+        import joblib
+        model = joblib.load(get_blob_store().path(blob_key))
+        size = len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return model
+
+        with self._lock:
+            if blob_key not in self._entries:
+                self._entries[blob_key] = (model, size)
+                self._total += size
+                while self._total > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._total -= evicted
+        return model
+
+
+model_cache = ModelCache(MODEL_CACHE_MB * 1024 * 1024)
@@ -1,8 +1,14 @@
+import os
+import threading
+import numpy as np
 import pandas as pd
+import sklearn
 from math import sqrt
-from sklearn.model_selection import train_test_split
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+from sklearn.model_selection import train_test_split, KFold
+from sklearn.utils.fixes import parse_version
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, OrdinalEncoder, FunctionTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import (
     mean_squared_error,
@@ -14,61 +20,308 @@ from sklearn.metrics import (
 )
 from sklearn.impute import SimpleImputer
 
-from backend.ml.classification_algorithms import CLASSIFICATION_ALGORITHMS
-from backend.ml.regression_algorithms import REGRESSION_ALGORITHMS
+from backend.instrumentation import stage, trace
+from backend.ml.registry import get_spec, make_estimator, is_classification, primary_metric
 
 
-def _make_ohe():
+# Categorical columns with more distinct values than this are target-encoded
+# instead of one-hot encoded
+OHE_MAX_CARDINALITY = int(os.getenv("OHE_MAX_CARDINALITY", 50))
+# Within one-hot columns, rarer categories are folded into one "infrequent" column
+OHE_MIN_FREQUENCY = float(os.getenv("OHE_MIN_FREQUENCY", 0.001))
+OHE_MAX_CATEGORIES = int(os.getenv("OHE_MAX_CATEGORIES", 50))
+
+# Models trained at once by train_many(), per experiment worker process
+COMPARE_THREADS = int(os.getenv("COMPARE_THREADS", 4))
+# Held-out rows scored per run; larger test splits are sampled down
+EVAL_MAX_ROWS = int(os.getenv("EVAL_MAX_ROWS", 200_000))
+BOOTSTRAP_ROUNDS = 200
+
+
+def _make_ohe(sparse: bool = False):
+    kwargs = dict(
+        handle_unknown="infrequent_if_exist",
+        min_frequency=OHE_MIN_FREQUENCY,
+        max_categories=OHE_MAX_CATEGORIES,
+    )
     try:
-        return OneHotEncoder(handle_unknown="ignore", sparse_output=False)
+        return OneHotEncoder(sparse_output=sparse, **kwargs)
     except TypeError:
-        return OneHotEncoder(handle_unknown="ignore", sparse=False)
+        return OneHotEncoder(sparse=sparse, **kwargs)
 
 
-def train_pipeline(df: pd.DataFrame, target: str, test_size: float = 0.2, algorithm: str = "linear_regression"):
-    if target not in df.columns:
-        raise ValueError(f"Target column '{target}' not found in dataframe")
+def _make_high_cardinality_encoder():
+    try:
+        from sklearn.preprocessing import TargetEncoder
+    except ImportError:   # scikit-learn < 1.3
+        return OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1)
+    # Seeded cross-fitting keeps runs deterministic (the result cache relies on it)
+    if parse_version(sklearn.__version__) >= parse_version("1.9"):
+        return TargetEncoder(cv=KFold(n_splits=5, shuffle=True, random_state=42))
+    return TargetEncoder(random_state=42)
 
-    X = df.drop(columns=[target])
-    y = df[target]
+
+def _to_float32(X):
+    return X.astype(np.float32)
+
+
+def build_preprocessor(X: pd.DataFrame, algorithm: str, cardinality: dict[str, int] | None = None):
+    """
+    Preprocessing for `X`, shaped by what the estimator accepts.
+
+    One-hot output stays sparse when the estimator takes sparse input, and is
+    downcast to float32 when the estimator allows it. `cardinality` (distinct
+    counts, normally from the dataset profile) routes high-cardinality columns
+    to a target encoder; missing entries are counted from `X`.
+    """
+    spec = get_spec(algorithm)
+    sparse = spec.get("sparse", True)
+    cardinality = cardinality or {}
 
     numeric_cols = X.select_dtypes(include=["number"]).columns.tolist()
     categorical_cols = [c for c in X.columns if c not in numeric_cols]
+    high_card_cols = [
+        c for c in categorical_cols
+        if (cardinality.get(c) if cardinality.get(c) is not None else X[c].nunique()) > OHE_MAX_CARDINALITY
+    ]
+    low_card_cols = [c for c in categorical_cols if c not in high_card_cols]
 
     numeric_tf = Pipeline(
         steps=[("imputer", SimpleImputer(strategy="median")), ("scaler", StandardScaler())]
     )
     categorical_tf = Pipeline(
-        steps=[("imputer", SimpleImputer(strategy="most_frequent")), ("onehot", _make_ohe())]
+        steps=[("imputer", SimpleImputer(strategy="most_frequent")), ("onehot", _make_ohe(sparse))]
     )
-
-    preprocessor = ColumnTransformer(
-        [("num", numeric_tf, numeric_cols), ("cat", categorical_tf, categorical_cols)]
+    high_card_tf = Pipeline(
+        steps=[("imputer", SimpleImputer(strategy="most_frequent")), ("encode", _make_high_cardinality_encoder())]
     )
 
-    if algorithm in CLASSIFICATION_ALGORITHMS:
-        model = CLASSIFICATION_ALGORITHMS[algorithm]["model"]
-    elif algorithm in REGRESSION_ALGORITHMS:
-        model = REGRESSION_ALGORITHMS[algorithm]["model"]
+    transformers = [("num", numeric_tf, numeric_cols), ("cat", categorical_tf, low_card_cols)]
+    if high_card_cols:
+        transformers.append(("high_card", high_card_tf, high_card_cols))
+    preprocessor = ColumnTransformer(transformers, sparse_threshold=0.3 if sparse else 0.0)
+
+    if not spec.get("float32", True):
+        return preprocessor
+    return Pipeline([
+        ("columns", preprocessor),
+        ("float32", FunctionTransformer(_to_float32, accept_sparse=True, feature_names_out="one-to-one")),
+    ])
+
+
+def _preprocessing_config(algorithm: str) -> tuple[bool, bool]:
+    """The spec flags build_preprocessor() depends on; equal configs share a fitted preprocessor."""
+    spec = get_spec(algorithm)
+    return spec.get("sparse", True), spec.get("float32", True)
+
+
+def compute_metrics(algorithm: str, y_true, preds) -> dict:
+    if is_classification(algorithm):
+        return {
+            "accuracy": float(accuracy_score(y_true, preds)),
+            "precision": float(precision_score(y_true, preds, average="weighted", zero_division=0)),
+            "recall": float(recall_score(y_true, preds, average="weighted", zero_division=0)),
+            "f1": float(f1_score(y_true, preds, average="weighted")),
+        }
+    mse = mean_squared_error(y_true, preds)
+    return {"rmse": float(sqrt(mse)), "r2": float(r2_score(y_true, preds))}
+
+
+def select_xy(df: pd.DataFrame, target: str, features: list[str] | None = None):
+    """Split `df` into the feature frame (default: every column but the target) and the target."""
+    if target not in df.columns:
+        raise ValueError(f"Target column '{target}' not found in dataframe")
+
+    if features:
+        missing = [f for f in features if f not in df.columns]
+        if missing:
+            raise ValueError(f"Feature column(s) not found in dataframe: {', '.join(missing)}")
+        X = df[[f for f in features if f != target]]
     else:
-        raise ValueError(f"Algorithm '{algorithm}' not supported")
+        X = df.drop(columns=[target])
+    return X, df[target]
 
-    pipeline = Pipeline([("pre", preprocessor), ("model", model)])
 
+def sample_positions(y: pd.Series, n: int | None, classification: bool) -> np.ndarray | None:
+    """Sorted positions of a seeded sample of at most `n` rows, stratified on `y` for classification; None keeps all."""
+    if n is None or len(y) <= n:
+        return None
+    positions = np.arange(len(y))
+    try:
+        picked, _ = train_test_split(positions, train_size=n, stratify=y if classification else None, random_state=42)
+    except ValueError:   # a class too rare to stratify on
+        picked, _ = train_test_split(positions, train_size=n, random_state=42)
+    return np.sort(picked)
+
+
+def split_data(X: pd.DataFrame, y: pd.Series, test_size: float, algorithm: str, max_rows: int | None = None):
+    """
+    The seeded train/test split every training mode shares. The training part is
+    sampled down to `max_rows` and the test part to EVAL_MAX_ROWS; the returned
+    dict describes any sampling as "sample.*" metric rows (empty when nothing was dropped).
+    """
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42)
-    pipeline.fit(X_train, y_train)
-    preds = pipeline.predict(X_test)
-
-    if any(k in algorithm for k in ["classifier", "logistic", "svm", "knn"]):
-        metrics = {
-            "accuracy": float(accuracy_score(y_test, preds)),
-            "precision": float(precision_score(y_test, preds, average="weighted", zero_division=0)),
-            "recall": float(recall_score(y_test, preds, average="weighted", zero_division=0)),
-            "f1": float(f1_score(y_test, preds, average="weighted")),
-        }
+    classification = is_classification(algorithm)
+    sampling = {}
+
+    pos = sample_positions(y_train, max_rows, classification)
+    if pos is not None:
+        sampling = {"sample.train_rows": float(len(pos)), "sample.fraction": len(pos) / len(y_train)}
+        X_train, y_train = X_train.iloc[pos], y_train.iloc[pos]
+    pos = sample_positions(y_test, EVAL_MAX_ROWS, classification)
+    if pos is not None:
+        sampling["sample.test_rows"] = float(len(pos))
+        X_test, y_test = X_test.iloc[pos], y_test.iloc[pos]
+    return X_train, X_test, y_train, y_test, sampling
+
+
+def metric_interval(algorithm: str, y_true, preds) -> dict:
+    """Bootstrap 95% interval of the primary test metric, reported for sampled runs."""
+    name = primary_metric(algorithm)
+    y_true, preds = np.asarray(y_true), np.asarray(preds)
+    if is_classification(algorithm):
+        # Integer codes make the repeated scoring much cheaper than string labels
+        _, codes = np.unique(np.concatenate([y_true, preds]).astype(str), return_inverse=True)
+        y_true, preds = codes[:len(y_true)], codes[len(y_true):]
+        score = lambda t, p: f1_score(t, p, average="weighted")
     else:
-        mse = mean_squared_error(y_test, preds)
-        rmse = float(sqrt(mse))
-        metrics = {"rmse": rmse, "r2": float(r2_score(y_test, preds))}
+        score = r2_score
+    rng = np.random.default_rng(42)
+    scores = []
+    for _ in range(BOOTSTRAP_ROUNDS):
+        idx = rng.integers(0, len(y_true), len(y_true))
+        scores.append(score(y_true[idx], preds[idx]))
+    low, high = np.percentile(scores, [2.5, 97.5])
+    return {f"{name}.ci95_low": float(low), f"{name}.ci95_high": float(high)}
+
+
+def train_pipeline(
+    df: pd.DataFrame,
+    target: str,
+    test_size: float = 0.2,
+    algorithm: str = "linear_regression",
+    params: dict | None = None,
+    features: list[str] | None = None,
+    cardinality: dict[str, int] | None = None,
+    max_rows: int | None = None,
+):
+    """
+    Fit on `features` (default: every column but the target) and score on a held-out split.
+
+    With `max_rows`, training uses a stratified sample of that size; the metrics
+    then also carry the sample size and a bootstrap interval of the primary metric.
+    """
+    X, y = select_xy(df, target, features)
+
+    preprocessor = build_preprocessor(X, algorithm, cardinality)
+
+    # A fresh estimator per call; the registry only holds specs
+    model = make_estimator(algorithm, params)
+
+    pipeline = Pipeline([("pre", preprocessor), ("model", model)])
+
+    with stage("split"):
+        X_train, X_test, y_train, y_test, sampling = split_data(X, y, test_size, algorithm, max_rows)
+    with stage("fit"):
+        pipeline.fit(X_train, y_train)
+    with stage("predict"):
+        preds = pipeline.predict(X_test)
 
+    with stage("metrics"):
+        metrics = compute_metrics(algorithm, y_test, preds)
+        if sampling:
+            metrics.update(sampling)
+            metrics.update(metric_interval(algorithm, y_test, preds))
     return pipeline, metrics, X_test, y_test, preds
+
+
+def train_many(
+    df: pd.DataFrame,
+    target: str,
+    plans: dict[str, dict],
+    test_size: float = 0.2,
+    features: list[str] | None = None,
+    cardinality: dict[str, int] | None = None,
+):
+    """
+    Train several models on one shared split.
+
+    `plans` maps a caller key to {"algorithm", "params", "max_rows"} (see
+    backend/ml/strategy.py); streamed plans go to strategy.train_incremental()
+    instead. Each model trains on the rows train_pipeline() would use: the
+    split's training part, sampled down to its plan's max_rows before the
+    preprocessor is fitted. A preprocessor is fitted once per distinct spec
+    config and sample size and its output reused by every model sharing both;
+    the models then fit concurrently in threads (most estimators release the
+    GIL in their native code). Returns ({key: (pipeline, metrics, preds) or the
+    exception raised}, X_test, y_test). Each model's metrics also carry its own
+    fit/predict timings (see backend/instrumentation.py), while the shared
+    stages go to the caller's trace.
+
+    An exception raised in the calling thread while the models train (the
+    job's time budget, see strategy.time_budget()) propagates. Queued models
+    are cancelled, and running ones stop at their next stage boundary: a fit
+    already under way cannot be interrupted and finishes in the background.
+    """
+    X, y = select_xy(df, target, features)
+    first = next(iter(plans.values()))["algorithm"]
+    with stage("split"):
+        X_train, X_test, y_train, y_test, _ = split_data(X, y, test_size, first)
+
+    def prepare_key(plan) -> tuple:
+        return _preprocessing_config(plan["algorithm"]), plan.get("max_rows")
+
+    prepared = {}
+    with stage("preprocess"):
+        for plan in plans.values():
+            key = prepare_key(plan)
+            if key in prepared:
+                continue
+            pos = sample_positions(y_train, plan.get("max_rows"), is_classification(plan["algorithm"]))
+            X_fit, y_fit = (X_train, y_train) if pos is None else (X_train.iloc[pos], y_train.iloc[pos])
+            pre = build_preprocessor(X, plan["algorithm"], cardinality)
+            prepared[key] = (pre, pre.fit_transform(X_fit, y_fit), y_fit, pos, pre.transform(X_test))
+
+    stop = threading.Event()
+
+    def check_stop():
+        if stop.is_set():
+            raise CancelledError()
+
+    def fit_one(plan):
+        algorithm = plan["algorithm"]
+        pre, Xt_train, yt_train, pos, Xt_test = prepared[prepare_key(plan)]
+        check_stop()
+        # Threads do not share the caller's trace; time this model on its own
+        with trace() as timer:
+            model = make_estimator(algorithm, plan.get("params"))
+            with stage("fit"):
+                model.fit(Xt_train, yt_train)
+            check_stop()
+            with stage("predict"):
+                preds = model.predict(Xt_test)
+            check_stop()
+            with stage("metrics"):
+                metrics = compute_metrics(algorithm, y_test, preds)
+                if pos is not None:
+                    metrics.update({"sample.train_rows": float(len(pos)), "sample.fraction": len(pos) / len(y_train)})
+                    metrics.update(metric_interval(algorithm, y_test, preds))
+        metrics.update(timer.metrics())
+        return Pipeline([("pre", pre), ("model", model)]), metrics, preds
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(COMPARE_THREADS, len(plans))))
+    futures = {key: pool.submit(fit_one, plan) for key, plan in plans.items()}
+    try:
+        wait(futures.values())
+    except BaseException:
+        # Raised here, not by a model: give up on the whole group
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+    results = {
+        key: future.result() if future.exception() is None else future.exception()
+        for key, future in futures.items()
+    }
+    return results, X_test, y_test
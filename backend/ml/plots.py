@@ -1,53 +1,154 @@
-import matplotlib.pyplot as plt
+# backend/ml/plots.py
+"""
+Result plots, rendered with matplotlib's object-oriented API on the Agg
+backend. Nothing here touches pyplot's global figure state, so plots can be
+rendered from several threads at once.
+
+Scatters with more than PLOT_MAX_POINTS points are drawn as hexbin density
+plots: a million-point scatter is slow to draw and unreadable anyway.
+"""
 import io
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay, RocCurveDisplay
+import os
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from sklearn.metrics import auc, confusion_matrix, roc_curve
+
+PLOT_MAX_POINTS = int(os.getenv("PLOT_MAX_POINTS", 10_000))
+PLOT_DPI = int(os.getenv("PLOT_DPI", 100))
+HEXBIN_GRIDSIZE = 60
+
+
+def _figure():
+    fig = Figure(figsize=(6.4, 4.8), dpi=PLOT_DPI)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _png(fig) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def _points(ax, x, y):
+    """Scatter, or a log-scaled hexbin density plot above PLOT_MAX_POINTS points."""
+    if len(x) > PLOT_MAX_POINTS:
+        hb = ax.hexbin(x, y, gridsize=HEXBIN_GRIDSIZE, bins="log", mincnt=1, cmap="viridis")
+        ax.figure.colorbar(hb, ax=ax, label="count (log)")
+    else:
+        ax.scatter(x, y, alpha=0.6, s=12)
 
 
 def residual_plot(y_true, y_pred):
-    fig, ax = plt.subplots()
-    ax.scatter(y_pred, y_true - y_pred, alpha=0.6)
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    fig, ax = _figure()
+    _points(ax, y_pred, y_true - y_pred)
+    ax.axhline(0, color="grey", linewidth=1)
     ax.set_xlabel("Predicted")
     ax.set_ylabel("Residuals")
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png")
-    plt.close(fig)   # prevent memory leaks
-    buf.seek(0)
-    return buf.getvalue()
+    return _png(fig)
 
 
 def predicted_vs_actual(y_true, y_pred):
-    fig, ax = plt.subplots()
-    ax.scatter(y_true, y_pred, alpha=0.6)
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    fig, ax = _figure()
+    _points(ax, y_true, y_pred)
+    lo, hi = min(y_true.min(), y_pred.min()), max(y_true.max(), y_pred.max())
+    ax.plot([lo, hi], [lo, hi], color="grey", linewidth=1)
     ax.set_xlabel("Actual")
     ax.set_ylabel("Predicted")
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    return _png(fig)
 
 
 def confusion_matrix_plot(y_true, y_pred):
-    cm = confusion_matrix(y_true, y_pred)
-    fig, ax = plt.subplots()
-    disp = ConfusionMatrixDisplay(confusion_matrix=cm)
-    disp.plot(ax=ax, cmap="Blues", values_format="d", colorbar=False)
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+    cm = confusion_matrix(y_true, y_pred, labels=labels)
+    fig, ax = _figure()
+    ax.imshow(cm, cmap="Blues")
+    threshold = cm.max() / 2
+    for (i, j), v in np.ndenumerate(cm):
+        ax.text(j, i, str(v), ha="center", va="center", color="white" if v > threshold else "black")
+    ax.set_xticks(range(len(labels)), [str(l) for l in labels])
+    ax.set_yticks(range(len(labels)), [str(l) for l in labels])
+    ax.set_xlabel("Predicted label")
+    ax.set_ylabel("True label")
+    return _png(fig)
+
+
+def roc_curve_plot(y_true, scores, pos_label):
+    """Binary ROC curve from positive-class scores; None when there is nothing to plot."""
+    if scores is None or len(np.unique(y_true)) != 2:
+        return None
+    fpr, tpr, _ = roc_curve(y_true, scores, pos_label=pos_label)
+    fig, ax = _figure()
+    ax.plot(fpr, tpr, label=f"AUC = {auc(fpr, tpr):.3f}")
+    ax.plot([0, 1], [0, 1], color="grey", linestyle="--", linewidth=1)
+    ax.set_xlabel("False Positive Rate")
+    ax.set_ylabel("True Positive Rate")
+    ax.legend(loc="lower right")
+    return _png(fig)
 
 
-def roc_curve_plot(model, X_test, y_test):
-    """Works only if classifier has predict_proba."""
+def positive_scores(model, X_test):
+    """(scores, pos_label) for a binary classifier with predict_proba, else (None, None)."""
+    classes = getattr(model, "classes_", None)
+    if classes is None or len(classes) != 2 or not hasattr(model, "predict_proba"):
+        return None, None
     try:
-        fig, ax = plt.subplots()
-        RocCurveDisplay.from_estimator(model, X_test, y_test, ax=ax)
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        plt.close(fig)
-        buf.seek(0)
-        return buf.getvalue()
+        return model.predict_proba(X_test)[:, 1], classes[1]
     except Exception:
+        return None, None
+
+
+# ============================
+# Plot data
+# ============================
+# Binned, JSON-safe summaries behind each plot, for clients that draw their own
+# charts. Their size depends on the bin counts, not on the test-set size.
+HIST_BINS = 50
+HIST2D_BINS = 40
+ROC_MAX_POINTS = 200
+
+
+def residual_histogram(y_true, y_pred) -> dict:
+    residuals = np.asarray(y_true, dtype=float) - np.asarray(y_pred, dtype=float)
+    counts, edges = np.histogram(residuals, bins=HIST_BINS)
+    return {"kind": "histogram", "x_label": "Residual", "edges": edges.tolist(), "counts": counts.tolist()}
+
+
+def predicted_vs_actual_bins(y_true, y_pred) -> dict:
+    """2D histogram on a shared square range; counts[i][j] is actual bin i, predicted bin j."""
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    lo, hi = min(y_true.min(), y_pred.min()), max(y_true.max(), y_pred.max())
+    counts, x_edges, y_edges = np.histogram2d(y_true, y_pred, bins=HIST2D_BINS, range=[[lo, hi], [lo, hi]])
+    return {
+        "kind": "hist2d",
+        "x_label": "Actual",
+        "y_label": "Predicted",
+        "x_edges": x_edges.tolist(),
+        "y_edges": y_edges.tolist(),
+        "counts": counts.astype(int).tolist(),
+    }
+
+
+def confusion_matrix_data(y_true, y_pred) -> dict:
+    labels = np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))
+    cm = confusion_matrix(y_true, y_pred, labels=labels)
+    return {"kind": "confusion_matrix", "labels": [str(l) for l in labels], "matrix": cm.tolist()}
+
+
+def roc_curve_data(y_true, scores, pos_label) -> dict | None:
+    """ROC vertices decimated to about ROC_MAX_POINTS, keeping both end points."""
+    if scores is None or len(np.unique(y_true)) != 2:
         return None
+    fpr, tpr, _ = roc_curve(y_true, scores, pos_label=pos_label)
+    area = auc(fpr, tpr)
+    if len(fpr) > ROC_MAX_POINTS:
+        keep = np.unique(np.linspace(0, len(fpr) - 1, ROC_MAX_POINTS).round().astype(int))
+        fpr, tpr = fpr[keep], tpr[keep]
+    return {"kind": "roc", "fpr": fpr.tolist(), "tpr": tpr.tolist(), "auc": float(area)}
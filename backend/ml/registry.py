@@ -0,0 +1,112 @@
+# backend/ml/registry.py
+"""
+Lookup over both algorithm registries.
+
+Registry entries are specs (estimator class path + default params). Every run
+gets its own estimator from make_estimator(), so concurrent experiments in
+threads or processes never share, and never refit, the same object. Estimator
+modules are imported the first time an algorithm is used, not with the registry.
+
+Spec keys:
+  type, description, best_for   shown by the API (PUBLIC_FIELDS)
+  estimator       dotted path of the estimator class
+  params          its default parameters
+  sparse, float32 whether it accepts sparse / float32 input (default True);
+                  build_preprocessor() shapes its output by them
+  parallel        gets n_jobs=MODEL_N_JOBS unless the run overrides it
+  search_space    candidate values per parameter for the CV search modes
+                  (backend/ml/search.py); grid/halving try every combination,
+                  random samples them
+  large_data      {"algorithm", "params"} to use instead on large datasets
+  streaming       the same, naming the incremental learner for datasets too big to load
+  max_rows        cap on the training rows
+  incremental     can train with partial_fit over streamed batches
+The scale hints (large_data, streaming, max_rows, incremental) are read by
+backend/ml/strategy.py.
+"""
+import os
+import inspect
+from functools import cache
+from importlib import import_module
+
+from backend.ml.classification_algorithms import CLASSIFICATION_ALGORITHMS
+from backend.ml.regression_algorithms import REGRESSION_ALGORITHMS
+
+# Threads per estimator for specs marked "parallel". Experiments already run
+# in parallel on the job pool, so the default avoids oversubscribing cores.
+MODEL_N_JOBS = int(os.getenv("MODEL_N_JOBS", 1))
+
+ALGORITHMS = {**CLASSIFICATION_ALGORITHMS, **REGRESSION_ALGORITHMS}
+
+PUBLIC_FIELDS = ("type", "description", "best_for")
+
+# Training modes a run can ask for; backend/ml/search.py implements all but holdout.
+# Kept here so the API can validate runs without importing the search stack.
+HOLDOUT = "holdout"
+MODES = (HOLDOUT, "cv", "grid", "random", "halving")
+
+
+def get_spec(algorithm: str) -> dict:
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Algorithm '{algorithm}' not supported")
+    return ALGORITHMS[algorithm]
+
+
+def is_classification(algorithm: str) -> bool:
+    return get_spec(algorithm)["type"] == "classification"
+
+
+def primary_metric(algorithm: str) -> str:
+    """The metric runs of this task are ranked by (higher is better)."""
+    return "f1" if is_classification(algorithm) else "r2"
+
+
+@cache
+def estimator_class(algorithm: str) -> type:
+    module, _, name = get_spec(algorithm)["estimator"].rpartition(".")
+    return getattr(import_module(module), name)
+
+
+def _accepted_params(estimator_cls) -> set[str]:
+    return {
+        name for name, p in inspect.signature(estimator_cls.__init__).parameters.items()
+        if name != "self" and p.kind != p.VAR_KEYWORD
+    }
+
+
+def resolve_params(algorithm: str, overrides: dict | None = None) -> dict:
+    """Registry defaults merged with user overrides; raises ValueError on unknown names."""
+    spec = get_spec(algorithm)
+    accepted = _accepted_params(estimator_class(algorithm))
+    unknown = sorted(set(overrides or {}) - accepted)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s) for '{algorithm}': {', '.join(unknown)}")
+
+    params = dict(spec["params"])
+    if spec.get("parallel"):
+        params["n_jobs"] = MODEL_N_JOBS
+    params.update(overrides or {})
+    return params
+
+
+def make_estimator(algorithm: str, overrides: dict | None = None):
+    """A new, unfitted estimator for one run."""
+    return estimator_class(algorithm)(**resolve_params(algorithm, overrides))
+
+
+def search_space(algorithm: str, fixed: dict | None = None) -> dict:
+    """The registry search space minus parameters the run pinned in `fixed`."""
+    space = get_spec(algorithm).get("search_space", {})
+    return {k: list(v) for k, v in space.items() if k not in (fixed or {})}
+
+
+def describe(registry: dict) -> dict:
+    """JSON-safe view of a registry for the API: descriptions, default params and search space."""
+    return {
+        name: {
+            **{k: spec[k] for k in PUBLIC_FIELDS},
+            "params": resolve_params(name),
+            "search_space": search_space(name),
+        }
+        for name, spec in registry.items()
+    }
@@ -1,44 +1,92 @@
 # backend/ml/regression_algorithms.py
 
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.tree import DecisionTreeRegressor
-
+# Entry format: see backend/ml/registry.py
 REGRESSION_ALGORITHMS = {
     "linear_regression": {
         "type": "regression",
         "description": "Fits a straight line to predict a continuous numeric target.",
         "best_for": "Continuous numeric datasets with linear relationships.",
-        "model": LinearRegression(),
+        "estimator": "sklearn.linear_model.LinearRegression",
+        "params": {},
+        "streaming": {"algorithm": "sgd_regressor", "params": {"penalty": None}},
+        "search_space": {"fit_intercept": [True, False]},
+        "parallel": True,
     },
     "ridge_regression": {
         "type": "regression",
         "description": "Linear regression with L2 regularization to reduce overfitting.",
         "best_for": "Numeric datasets with many correlated features or risk of overfitting.",
-        "model": Ridge(),
+        "estimator": "sklearn.linear_model.Ridge",
+        "params": {},
+        "streaming": {"algorithm": "sgd_regressor", "params": {"penalty": "l2"}},
+        "search_space": {"alpha": [0.01, 0.1, 1.0, 10.0, 100.0]},
     },
     "lasso_regression": {
         "type": "regression",
         "description": "Linear regression with L1 regularization to perform feature selection.",
         "best_for": "Sparse datasets where you want to eliminate irrelevant features.",
-        "model": Lasso(),
+        "estimator": "sklearn.linear_model.Lasso",
+        "params": {"random_state": 42},
+        "streaming": {"algorithm": "sgd_regressor", "params": {"penalty": "l1"}},
+        "search_space": {"alpha": [0.0001, 0.001, 0.01, 0.1, 1.0]},
     },
     "random_forest_regressor": {
         "type": "regression",
         "description": "Ensemble of decision trees for robust predictions.",
         "best_for": "Large datasets with non-linear relationships.",
-        "model": RandomForestRegressor(),
+        "estimator": "sklearn.ensemble.RandomForestRegressor",
+        "params": {"random_state": 42},
+        "max_rows": 1_000_000,
+        "search_space": {
+            "n_estimators": [100, 200, 400],
+            "max_depth": [None, 10, 20],
+            "min_samples_leaf": [1, 2, 5],
+            "max_features": ["sqrt", 1.0],
+        },
+        "parallel": True,
     },
     "gradient_boosting_regressor": {
         "type": "regression",
         "description": "Boosting method that combines weak learners to create strong models.",
         "best_for": "Complex non-linear regression problems where accuracy is key.",
-        "model": GradientBoostingRegressor(),
+        "estimator": "sklearn.ensemble.GradientBoostingRegressor",
+        "params": {"random_state": 42},
+        "large_data": {"algorithm": "hist_gradient_boosting_regressor"},
+        "search_space": {
+            "n_estimators": [100, 200, 400],
+            "learning_rate": [0.03, 0.1, 0.3],
+            "max_depth": [2, 3, 5],
+            "subsample": [0.8, 1.0],
+        },
     },
     "decision_tree_regressor": {
         "type": "regression",
         "description": "Single decision tree model for regression tasks.",
         "best_for": "Simple datasets where interpretability is important.",
-        "model": DecisionTreeRegressor(),
+        "estimator": "sklearn.tree.DecisionTreeRegressor",
+        "params": {"random_state": 42},
+        "search_space": {"max_depth": [None, 5, 10, 20], "min_samples_leaf": [1, 5, 20]},
+    },
+    "hist_gradient_boosting_regressor": {
+        "type": "regression",
+        "description": "Gradient boosting on binned features; much faster than classic boosting on large data.",
+        "best_for": "Large tabular datasets (hundreds of thousands of rows and up).",
+        "estimator": "sklearn.ensemble.HistGradientBoostingRegressor",
+        "params": {"random_state": 42},
+        "search_space": {
+            "learning_rate": [0.03, 0.1, 0.3],
+            "max_leaf_nodes": [15, 31, 63],
+            "l2_regularization": [0.0, 0.1, 1.0],
+        },
+        "sparse": False,
+    },
+    "sgd_regressor": {
+        "type": "regression",
+        "description": "Linear model fitted by stochastic gradient descent, one batch at a time.",
+        "best_for": "Very large datasets with mostly linear relationships.",
+        "estimator": "sklearn.linear_model.SGDRegressor",
+        "params": {"random_state": 42},
+        "search_space": {"alpha": [0.00001, 0.0001, 0.001], "penalty": ["l2", "l1", "elasticnet"]},
+        "incremental": True,
     },
 }
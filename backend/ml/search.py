@@ -0,0 +1,161 @@
+# backend/ml/search.py
+"""
+Cross-validation and hyperparameter search modes.
+
+The same held-out split as train_pipeline() is kept for the reported metrics
+and plots; CV and search only ever see the training part. Folds and candidates
+run in parallel on joblib's process pool (SEARCH_N_JOBS), and in the search
+modes the pipeline caches each fitted preprocessor on disk (Pipeline(memory=)),
+so candidates that only differ in model parameters reuse the transformed folds.
+"""
+import os
+import tempfile
+
+import numpy as np
+from joblib import Memory
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.metrics import make_scorer, precision_score, recall_score
+from sklearn.model_selection import (
+    cross_validate, KFold, StratifiedKFold, ParameterGrid,
+    GridSearchCV, RandomizedSearchCV, HalvingGridSearchCV,
+)
+from sklearn.pipeline import Pipeline
+
+from backend.instrumentation import stage
+from backend.ml.pipeline import build_preprocessor, compute_metrics, metric_interval, select_xy, split_data
+from backend.ml.registry import HOLDOUT, MODES, make_estimator, is_classification, primary_metric, search_space
+
+# Worker processes per CV run. Experiments already run in parallel on the job
+# pool, so keep this small unless EXPERIMENT_WORKERS is lowered to match.
+SEARCH_N_JOBS = int(os.getenv("SEARCH_N_JOBS", 2))
+
+# name -> (sklearn scoring, sign to turn the score back into the metric)
+CLASSIFICATION_SCORERS = {
+    "accuracy": ("accuracy", 1),
+    "precision": (make_scorer(precision_score, average="weighted", zero_division=0), 1),
+    "recall": (make_scorer(recall_score, average="weighted", zero_division=0), 1),
+    "f1": ("f1_weighted", 1),
+}
+REGRESSION_SCORERS = {
+    "rmse": ("neg_root_mean_squared_error", -1),
+    "r2": ("r2", 1),
+}
+
+
+def _scorers(algorithm: str) -> tuple[dict, str]:
+    """Scorers for the task plus the one candidates are ranked by."""
+    scorers = CLASSIFICATION_SCORERS if is_classification(algorithm) else REGRESSION_SCORERS
+    return scorers, primary_metric(algorithm)
+
+
+def _splitter(algorithm: str, cv_folds: int):
+    cls = StratifiedKFold if is_classification(algorithm) else KFold
+    return cls(n_splits=cv_folds, shuffle=True, random_state=42)
+
+
+def _make_search(mode, pipeline, space, cv, scorers, primary, n_iter):
+    grid = {f"model__{k}": v for k, v in space.items()}
+    scoring = {name: s for name, (s, _) in scorers.items()}
+    if mode == "grid":
+        return GridSearchCV(pipeline, grid, cv=cv, scoring=scoring, refit=primary, n_jobs=SEARCH_N_JOBS)
+    if mode == "random":
+        return RandomizedSearchCV(
+            pipeline, grid, n_iter=min(n_iter, len(ParameterGrid(grid))), cv=cv,
+            scoring=scoring, refit=primary, n_jobs=SEARCH_N_JOBS, random_state=42,
+        )
+    if mode == "halving":
+        # Successive halving: every candidate starts on a small sample and only
+        # the best third advances to the next, larger round. Single-metric only.
+        return HalvingGridSearchCV(
+            pipeline, grid, cv=cv, scoring=scorers[primary][0], factor=3,
+            n_jobs=SEARCH_N_JOBS, random_state=42,
+        )
+    raise ValueError(f"Unknown experiment mode '{mode}'")
+
+
+def _fold_scores(search, scorers: dict, primary: str, cv_folds: int) -> dict[str, list[float]]:
+    """Per-fold test scores of the best candidate, keyed by metric name."""
+    results, best = search.cv_results_, search.best_index_
+    if isinstance(search.scoring, dict):
+        keys = {name: f"test_{name}" for name in scorers}
+    else:
+        keys = {primary: "test_score"}
+    return {
+        name: [scorers[name][1] * float(results[f"split{i}_{key}"][best]) for i in range(cv_folds)]
+        for name, key in keys.items()
+    }
+
+
+def cv_metrics(fold_scores: dict[str, list[float]]) -> dict[str, float]:
+    """Flatten fold scores into metric rows: cv.<metric>.fold<i>, .mean and .std."""
+    out = {}
+    for name, scores in fold_scores.items():
+        for i, score in enumerate(scores, start=1):
+            out[f"cv.{name}.fold{i}"] = score
+        out[f"cv.{name}.mean"] = float(np.mean(scores))
+        out[f"cv.{name}.std"] = float(np.std(scores))
+    return out
+
+
+def search_pipeline(
+    df,
+    target: str,
+    mode: str,
+    test_size: float = 0.2,
+    algorithm: str = "linear_regression",
+    params: dict | None = None,
+    features: list[str] | None = None,
+    cardinality: dict[str, int] | None = None,
+    cv_folds: int = 5,
+    n_iter: int = 20,
+    max_rows: int | None = None,
+):
+    """
+    Run `mode` ("cv", "grid", "random" or "halving") on the training split.
+
+    Returns train_pipeline()'s (pipeline, metrics, X_test, y_test, preds) plus
+    a dict with "metrics" (per-fold CV scores) and "best_params" (the winning
+    search candidate; empty in plain CV mode). Parameters pinned in `params`
+    are left out of the search space. `max_rows` samples the training split
+    as in train_pipeline().
+    """
+    if mode not in MODES or mode == HOLDOUT:
+        raise ValueError(f"Unknown experiment mode '{mode}'")
+
+    X, y = select_xy(df, target, features)
+    with stage("split"):
+        X_train, X_test, y_train, y_test, sampling = split_data(X, y, test_size, algorithm, max_rows)
+
+    scorers, primary = _scorers(algorithm)
+    cv = _splitter(algorithm, cv_folds)
+    best_params = {}
+
+    with stage("search"), tempfile.TemporaryDirectory(prefix="search-cache-") as cache_dir:
+        pipeline = Pipeline(
+            [("pre", build_preprocessor(X, algorithm, cardinality)), ("model", make_estimator(algorithm, params))],
+            memory=Memory(cache_dir, verbose=0) if mode != "cv" else None,
+        )
+        if mode == "cv":
+            scores = cross_validate(
+                pipeline, X_train, y_train, cv=cv,
+                scoring={name: s for name, (s, _) in scorers.items()}, n_jobs=SEARCH_N_JOBS,
+            )
+            fold_scores = {name: [sign * float(v) for v in scores[f"test_{name}"]] for name, (_, sign) in scorers.items()}
+            pipeline.fit(X_train, y_train)
+        else:
+            search = _make_search(mode, pipeline, search_space(algorithm, params), cv, scorers, primary, n_iter)
+            search.fit(X_train, y_train)
+            fold_scores = _fold_scores(search, scorers, primary, cv_folds)
+            best_params = {k.removeprefix("model__"): v for k, v in search.best_params_.items()}
+            pipeline = search.best_estimator_
+        # The cache directory is gone once we return; the stored model must not point at it
+        pipeline.set_params(memory=None)
+
+    with stage("predict"):
+        preds = pipeline.predict(X_test)
+    with stage("metrics"):
+        metrics = compute_metrics(algorithm, y_test, preds)
+        if sampling:
+            metrics.update(sampling)
+            metrics.update(metric_interval(algorithm, y_test, preds))
+    return pipeline, metrics, X_test, y_test, preds, {"metrics": cv_metrics(fold_scores), "best_params": best_params}
@@ -0,0 +1,196 @@
+# backend/ml/strategy.py
+"""
+Scale-aware training strategy.
+
+plan() picks how to train an algorithm from the dataset's profiled row count,
+using the scale hints in the registries:
+
+- above LARGE_DATASET_ROWS, "large_data" swaps in an estimator that scales
+  (histogram gradient boosting, a calibrated linear SVM);
+- above STREAMING_ROWS, "streaming" swaps in an incremental learner, which
+  train_incremental() fits with partial_fit over streamed Parquet batches;
+- otherwise training uses at most "max_rows" / MAX_TRAIN_ROWS rows, as a
+  stratified sample reported with a bootstrap interval on the test metric.
+
+Runs with explicit params keep the requested estimator (the params may not
+apply to the substitute). time_budget() bounds the wall time of a job.
+"""
+import os
+import signal
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from backend import storage
+from backend.instrumentation import stage
+from backend.ml.pipeline import (
+    EVAL_MAX_ROWS, build_preprocessor, compute_metrics, metric_interval, select_xy,
+)
+from backend.ml.registry import get_spec, make_estimator, is_classification
+
+LARGE_DATASET_ROWS = int(os.getenv("LARGE_DATASET_ROWS", 200_000))
+STREAMING_ROWS = int(os.getenv("STREAMING_ROWS", 2_000_000))
+MAX_TRAIN_ROWS = int(os.getenv("MAX_TRAIN_ROWS", 1_000_000))
+STREAM_BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", 100_000))
+# Rows the preprocessor is fitted on before streaming starts
+PREPROCESS_SAMPLE_ROWS = int(os.getenv("PREPROCESS_SAMPLE_ROWS", 100_000))
+# Wall-clock limit per experiment (0 disables)
+EXPERIMENT_TIME_BUDGET_SECONDS = int(os.getenv("EXPERIMENT_TIME_BUDGET_SECONDS", 3600))
+
+
+def plan(algorithm: str, row_count: int | None, params: dict | None = None) -> dict:
+    """
+    How to train `algorithm` on `row_count` rows:
+    {"requested", "algorithm", "params", "max_rows", "stream", "row_count"}.
+    """
+    spec = get_spec(algorithm)
+    rows = row_count or 0
+    chosen, chosen_params = algorithm, params or None
+    if not params:
+        if spec.get("streaming") and rows > STREAMING_ROWS:
+            swap = spec["streaming"]
+        elif spec.get("large_data") and rows > LARGE_DATASET_ROWS:
+            swap = spec["large_data"]
+        else:
+            swap = None
+        if swap:
+            chosen, chosen_params = swap["algorithm"], swap.get("params") or None
+
+    chosen_spec = get_spec(chosen)
+    incremental = bool(chosen_spec.get("incremental"))
+    return {
+        "requested": algorithm,
+        "algorithm": chosen,
+        "params": chosen_params,
+        # Incremental learners are linear in the row count; no need to sample them
+        "max_rows": None if incremental else min(chosen_spec.get("max_rows", MAX_TRAIN_ROWS), MAX_TRAIN_ROWS),
+        "stream": incremental and rows > STREAMING_ROWS,
+        "row_count": row_count,
+    }
+
+
+class TimeBudgetExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def time_budget(seconds: float):
+    """
+    Raise TimeBudgetExceeded in the block after `seconds` of wall time.
+
+    Uses SIGALRM, so it only arms in the main thread of a POSIX process (as in
+    the job pool workers); elsewhere it is a no-op. Native code that holds the
+    interpreter is interrupted as soon as it returns to Python.
+    """
+    if seconds <= 0 or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expired(signum, frame):
+        raise TimeBudgetExceeded(f"Experiment exceeded its time budget of {seconds:g} s")
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def train_incremental(
+    dataset_file,
+    target: str,
+    algorithm: str,
+    params: dict | None = None,
+    features: list[str] | None = None,
+    cardinality: dict[str, int] | None = None,
+    test_size: float = 0.2,
+    row_count: int | None = None,
+):
+    """
+    One partial_fit pass over the stored dataset, STREAM_BATCH_ROWS at a time.
+
+    Rows go to the test split by a seeded coin flip; up to EVAL_MAX_ROWS of them
+    are kept and scored at the end. The preprocessor is fitted on the first
+    PREPROCESS_SAMPLE_ROWS training rows. Returns train_pipeline()'s tuple.
+    """
+    classification = is_classification(algorithm)
+    columns = list(features) + [target] if features else None
+    classes = None
+    if classification:
+        # partial_fit needs every class up front; one column is cheap to read
+        classes = np.sort(storage.read_dataset(dataset_file, [target])[target].dropna().unique())
+
+    expected_test = max(1, int((row_count or 0) * test_size))
+    keep_test = min(1.0, EVAL_MAX_ROWS / expected_test)
+    rng = np.random.default_rng(42)
+
+    pre = model = None
+    head_X, head_y, buffered = [], [], 0
+    test_X, test_y, kept = [], [], 0
+    trained = batches = 0
+
+    def fit_batch(X, y):
+        with stage("preprocess"):
+            Xt = pre.transform(X)
+        with stage("fit"):
+            if classes is not None:
+                model.partial_fit(Xt, y, classes=classes)
+            else:
+                model.partial_fit(Xt, y)
+
+    for batch in storage.iter_batches(dataset_file, columns, STREAM_BATCH_ROWS):
+        X, y = select_xy(batch, target, features)
+        is_test = rng.random(len(X)) < test_size
+        keep = is_test & (rng.random(len(X)) < keep_test)
+        if kept < EVAL_MAX_ROWS and keep.any():
+            take = X[keep].iloc[:EVAL_MAX_ROWS - kept]
+            test_X.append(take)
+            test_y.append(y[keep].iloc[:len(take)])
+            kept += len(take)
+        X, y = X[~is_test], y[~is_test]
+        trained += len(X)
+        batches += 1
+
+        if pre is None:
+            head_X.append(X)
+            head_y.append(y)
+            buffered += len(X)
+            if buffered < PREPROCESS_SAMPLE_ROWS:
+                continue
+            X, y = pd.concat(head_X), pd.concat(head_y)
+            head_X = head_y = None
+            with stage("preprocess"):
+                pre = build_preprocessor(X, algorithm, cardinality).fit(X, y)
+            model = make_estimator(algorithm, params)
+        fit_batch(X, y)
+
+    if pre is None:
+        if not buffered:
+            raise ValueError("Dataset is empty")
+        X, y = pd.concat(head_X), pd.concat(head_y)
+        with stage("preprocess"):
+            pre = build_preprocessor(X, algorithm, cardinality).fit(X, y)
+        model = make_estimator(algorithm, params)
+        fit_batch(X, y)
+    if not kept:
+        raise ValueError("Not enough rows for a test split")
+
+    pipeline = Pipeline([("pre", pre), ("model", model)])
+    X_test, y_test = pd.concat(test_X), pd.concat(test_y)
+    with stage("predict"):
+        preds = pipeline.predict(X_test)
+
+    with stage("metrics"):
+        metrics = compute_metrics(algorithm, y_test, preds)
+        metrics.update({
+            "sample.train_rows": float(trained),
+            "sample.test_rows": float(kept),
+            "stream.batches": float(batches),
+        })
+        metrics.update(metric_interval(algorithm, y_test, preds))
+    return pipeline, metrics, X_test, y_test, preds
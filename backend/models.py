@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, LargeBinary, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Float, LargeBinary, Text, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from backend.db import Base
 
@@ -21,10 +21,12 @@ class Dataset(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    row_count = Column(Integer, nullable=True)   # set with the column profile at upload
 
     user = relationship("User", back_populates="datasets")
     files = relationship("DatasetFile", back_populates="dataset")
+    columns = relationship("DatasetColumn", back_populates="dataset", order_by="DatasetColumn.position")
     experiments = relationship("Experiment", back_populates="dataset")
 
 
@@ -34,11 +36,34 @@ class DatasetFile(Base):
     id = Column(Integer, primary_key=True, index=True)
     dataset_id = Column(Integer, ForeignKey("datasets.id"))
     filename = Column(String, nullable=False)
-    data = Column(LargeBinary, nullable=False)
+    format = Column(String, nullable=True)     # "parquet"; NULL = raw CSV/XLSX upload bytes
+    blob_key = Column(String(64), nullable=True)   # sha256 in the blob store
+    size = Column(BigInteger, nullable=True)
+    data = deferred(Column(LargeBinary, nullable=True))   # legacy rows only
 
     dataset = relationship("Dataset", back_populates="files")
 
 
+class DatasetColumn(Base):
+    """Per-column profile computed once at upload, so schema lookups never touch the data."""
+    __tablename__ = "dataset_columns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), index=True, nullable=False)
+    position = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    dtype = Column(String, nullable=False)
+    null_count = Column(Integer, nullable=True)
+    distinct_count = Column(Integer, nullable=True)
+    min_value = Column(Float, nullable=True)     # numeric columns only
+    max_value = Column(Float, nullable=True)
+    mean = Column(Float, nullable=True)
+    # JSON value distribution (see profiling.histogram()); deferred so schema lookups skip it
+    histogram = deferred(Column(Text, nullable=True))
+
+    dataset = relationship("Dataset", back_populates="columns")
+
+
 class Experiment(Base):
     __tablename__ = "experiments"
 
@@ -50,18 +75,31 @@ class Experiment(Base):
     target = Column(String, nullable=True)
     features = Column(Text, nullable=True)     # store comma-separated list
     algorithm = Column(String, nullable=True)
-    status = Column(String, default="done")
+    params = Column(Text, nullable=True)       # JSON estimator hyperparameter overrides
+    split = Column(Float, default=0.2)
+    mode = Column(String, nullable=True)       # see backend/ml/registry.py MODES; NULL = holdout
+    search = Column(Text, nullable=True)       # JSON {"cv_folds", "n_iter"} for the CV/search modes
+    cache_key = Column(String(64), nullable=True, index=True)   # see backend/result_cache.py
+    run_group = Column(String(32), nullable=True, index=True)   # shared by the runs of one /experiments/compare
+    status = Column(String, default="queued")   # queued -> running -> done | failed
+    error = Column(Text, nullable=True)
 
     dataset = relationship("Dataset", back_populates="experiments")
     metrics = relationship("ExperimentMetric", back_populates="experiment")
     artifacts = relationship("ExperimentArtifact", back_populates="experiment")
 
+    __table_args__ = (
+        # History page: keyset pagination, globally and per dataset
+        Index("ix_experiments_created_at_id", "created_at", "id"),
+        Index("ix_experiments_dataset_created_at_id", "dataset_id", "created_at", "id"),
+    )
+
 
 class ExperimentMetric(Base):
     __tablename__ = "experiment_metrics"
 
     id = Column(Integer, primary_key=True, index=True)
-    experiment_id = Column(Integer, ForeignKey("experiments.id"))
+    experiment_id = Column(Integer, ForeignKey("experiments.id"), index=True)
     metric_name = Column(String, nullable=False)
     metric_value = Column(Float, nullable=False)
 
@@ -72,8 +110,15 @@ class ExperimentArtifact(Base):
     __tablename__ = "experiment_artifacts"
 
     id = Column(Integer, primary_key=True, index=True)
-    experiment_id = Column(Integer, ForeignKey("experiments.id"))
+    experiment_id = Column(Integer, ForeignKey("experiments.id"), index=True)
     artifact_path = Column(String, nullable=False)
-    data = Column(LargeBinary)
+    blob_key = Column(String(64), nullable=True)   # sha256 in the blob store
+    size = Column(BigInteger, nullable=True)
+    data = deferred(Column(LargeBinary))                  # legacy rows only
 
     experiment = relationship("Experiment", back_populates="artifacts")
+
+    __table_args__ = (
+        # One row per name; derived artifacts rendered by concurrent requests rely on it
+        Index("uq_experiment_artifacts_experiment_path", "experiment_id", "artifact_path", unique=True),
+    )
@@ -0,0 +1,156 @@
+# backend/plotting.py
+"""
+Deferred plot rendering.
+
+Training stores the test-set predictions as a small Parquet artifact and
+commits the run as done without waiting for plots. Everything plot-related is
+derived from that artifact afterwards and stored as ordinary artifacts:
+
+- plot_data.json, binned numbers behind every plot that the frontend draws
+  itself; the worker computes it right after the commit;
+- the PNGs, rendered only when something asks for them (the artifact
+  endpoint, the PDF report).
+"""
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend import storage
+from backend.blobstore import get_blob_store
+from backend.instrumentation import PLOT_RENDER_SECONDS
+from backend.models import Experiment
+from backend.ml.registry import is_classification
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PREDICTIONS_ARTIFACT = "predictions.parquet"
+PLOT_DATA_ARTIFACT = "plot_data.json"
+ROC_PLOT = "roc_curve.png"
+CLASSIFICATION_PLOTS = ("confusion_matrix.png", ROC_PLOT)
+REGRESSION_PLOTS = ("residual_plot.png", "predicted_vs_actual.png")
+PLOT_THREADS = int(os.getenv("PLOT_THREADS", 2))
+
+
+def predictions_bytes(y_true, y_pred, scores=None, pos_label=None) -> bytes:
+    """Parquet of y_true/y_pred, plus positive-class scores for binary classifiers."""
+    import pandas as pd
+
+    df = pd.DataFrame({"y_true": pd.Series(y_true).to_numpy(), "y_pred": pd.Series(y_pred).to_numpy()})
+    if scores is not None:
+        df["score"] = scores
+        df["positive"] = df["y_true"] == pos_label
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buf, compression="zstd")
+    return buf.getvalue()
+
+
+def plot_names(algorithm: str) -> tuple[str, ...]:
+    return CLASSIFICATION_PLOTS if is_classification(algorithm) else REGRESSION_PLOTS
+
+
+def derived_names(algorithm: str) -> tuple[str, ...]:
+    """Every artifact that can be derived from the predictions on demand."""
+    return plot_names(algorithm) + (PLOT_DATA_ARTIFACT,)
+
+
+def has_scores(columns) -> bool:
+    """Whether predictions with these columns can draw a ROC curve (binary classifiers with scores)."""
+    return "score" in columns
+
+
+def plot_data(predictions: "pd.DataFrame", classification: bool) -> dict:
+    """{plot name without extension: binned data} for the run's plots."""
+    from backend.ml import plots   # sklearn and matplotlib load on the first plot, not at startup
+
+    y_true, y_pred = predictions["y_true"], predictions["y_pred"]
+    if classification:
+        data = {"confusion_matrix": plots.confusion_matrix_data(y_true, y_pred)}
+        if has_scores(predictions):
+            roc = plots.roc_curve_data(predictions["positive"], predictions["score"], True)
+            if roc:
+                data["roc_curve"] = roc
+        return data
+    return {
+        "residual_plot": plots.residual_histogram(y_true, y_pred),
+        "predicted_vs_actual": plots.predicted_vs_actual_bins(y_true, y_pred),
+    }
+
+
+def render(name: str, predictions: "pd.DataFrame", classification: bool) -> bytes | None:
+    with PLOT_RENDER_SECONDS.labels(name).time():
+        return _render(name, predictions, classification)
+
+
+def _render(name: str, predictions: "pd.DataFrame", classification: bool) -> bytes | None:
+    from backend.ml import plots
+
+    y_true, y_pred = predictions["y_true"], predictions["y_pred"]
+    if name == PLOT_DATA_ARTIFACT:
+        return json.dumps(plot_data(predictions, classification)).encode()
+    if name == "residual_plot.png":
+        return plots.residual_plot(y_true, y_pred)
+    if name == "predicted_vs_actual.png":
+        return plots.predicted_vs_actual(y_true, y_pred)
+    if name == "confusion_matrix.png":
+        return plots.confusion_matrix_plot(y_true, y_pred)
+    if name == ROC_PLOT and has_scores(predictions):
+        return plots.roc_curve_plot(predictions["positive"], predictions["score"], True)
+    return None
+
+
+def _predictions_artifact(exp: Experiment):
+    return next((a for a in exp.artifacts if a.artifact_path == PREDICTIONS_ARTIFACT), None)
+
+
+def has_predictions(exp: Experiment) -> bool:
+    """Whether plots and plot data can be derived (runs from before deferred plots cannot)."""
+    return _predictions_artifact(exp) is not None
+
+
+def _prediction_columns(artifact) -> list[str]:
+    # The Parquet footer alone
+    source = get_blob_store().path(artifact.blob_key) if artifact.blob_key else io.BytesIO(artifact.data)
+    return pq.read_schema(source).names
+
+
+def applicable_plots(exp: Experiment) -> tuple[str, ...]:
+    """The run's PNG plots its predictions can draw; plot_data() covers the same ones."""
+    names = plot_names(exp.algorithm)
+    source = _predictions_artifact(exp)
+    if ROC_PLOT in names and source is not None and not has_scores(_prediction_columns(source)):
+        names = tuple(n for n in names if n != ROC_PLOT)
+    return names
+
+
+def available_plots(exp: Experiment) -> list[str]:
+    """Plot names a client can request: renderable ones, or the stored PNGs of older runs."""
+    if has_predictions(exp):
+        return list(applicable_plots(exp))
+    return [a.artifact_path for a in exp.artifacts if a.artifact_path.endswith(".png")]
+
+
+def ensure_plots(db, exp: Experiment, names=None) -> dict:
+    """
+    Render and store whichever of `names` (default: all of the run's PNG plots)
+    are missing, in parallel. Returns {name: artifact or None when not applicable}.
+    """
+    existing = {a.artifact_path: a for a in exp.artifacts}
+    wanted = list(names or applicable_plots(exp))
+    missing = [n for n in wanted if n not in existing]
+    source = existing.get(PREDICTIONS_ARTIFACT)
+    if missing and source is not None:
+        predictions = pq.read_table(io.BytesIO(storage.artifact_bytes(source))).to_pandas()
+        classification = is_classification(exp.algorithm)
+        with ThreadPoolExecutor(max_workers=max(1, min(PLOT_THREADS, len(missing)))) as pool:
+            rendered = dict(zip(missing, pool.map(lambda n: render(n, predictions, classification), missing)))
+        # One commit per artifact, so losing a race for one keeps the others
+        for name, data in rendered.items():
+            if data is not None:
+                existing[name] = storage.commit_artifact(db, storage.add_artifact(db, exp.id, name, data))
+    return {n: existing.get(n) for n in wanted}
@@ -0,0 +1,266 @@
+# backend/profiling.py
+"""
+Dataset profile: per-column dtype, null count, cardinality, numeric stats and
+a value histogram.
+
+Computed once when a dataset is uploaded and stored in `dataset_columns`, so
+the schema endpoints and the algorithm auto-suggestion never read the data.
+"""
+import os
+import json
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from backend import storage
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
+
+from backend.models import Dataset, DatasetColumn, DatasetFile
+
+DISTINCT_CAP = int(os.getenv("PROFILE_DISTINCT_CAP", 100_000))
+# Histograms are built from a uniform sample of at most this many rows (exact
+# below it), so profiling memory stays bounded on any dataset size
+HISTOGRAM_SAMPLE_ROWS = int(os.getenv("PROFILE_HISTOGRAM_SAMPLE_ROWS", 100_000))
+HISTOGRAM_BINS = int(os.getenv("PROFILE_HISTOGRAM_BINS", 30))
+HISTOGRAM_TOP_VALUES = int(os.getenv("PROFILE_HISTOGRAM_TOP_VALUES", 20))
+
+
+def _is_numeric(t: pa.DataType) -> bool:
+    return pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t)
+
+
+def _finite(value):
+    if value is None:
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _json_safe(value):
+    if isinstance(value, float):
+        return value if math.isfinite(value) else str(value)
+    return value if isinstance(value, (str, int, bool)) else str(value)
+
+
+def histogram(sample: pa.ChunkedArray, non_null: int, lo: float | None, hi: float | None, sampled: bool) -> dict | None:
+    """
+    Value distribution of a column from `sample`, with counts scaled up to the
+    column's `non_null` values. Numeric columns (lo/hi set) get HISTOGRAM_BINS
+    equal-width bins over [lo, hi]; others their HISTOGRAM_TOP_VALUES most
+    frequent values plus an "other" count. None when there is nothing to count.
+    """
+    sample = sample.drop_null()
+    if non_null == 0 or len(sample) == 0:
+        return None
+    scale = non_null / len(sample)
+    meta = {"sampled": sampled, "sample_size": len(sample)}
+
+    if lo is not None and hi is not None:
+        values = sample.to_numpy().astype(float)
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS, range=(lo, hi))
+        return {"kind": "numeric", "edges": edges.tolist(), "counts": [round(c * scale) for c in counts], **meta}
+
+    value_counts = pc.value_counts(sample)
+    pairs = sorted(
+        zip(value_counts.field("values").to_pylist(), value_counts.field("counts").to_pylist()),
+        key=lambda p: p[1], reverse=True,
+    )
+    top = pairs[:HISTOGRAM_TOP_VALUES]
+    counts = [round(c * scale) for _, c in top]
+    return {
+        "kind": "categorical",
+        "values": [_json_safe(v) for v, _ in top],
+        "counts": counts,
+        "other": max(0, non_null - sum(counts)),
+        **meta,
+    }
+
+
+class ProfileBuilder:
+    """
+    Accumulates the profile batch by batch so ingest never needs the whole table.
+
+    Distinct values are tracked exactly up to DISTINCT_CAP per column; past that
+    the count saturates at the cap, which callers treat as "high cardinality".
+    Histograms come from a reservoir sample of whole rows: every row gets a
+    random key and the HISTOGRAM_SAMPLE_ROWS rows with the smallest keys are kept.
+    """
+
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self.row_count = 0
+        self._nulls = [0] * len(schema)
+        self._distinct = [set() for _ in schema]
+        self._saturated = [False] * len(schema)
+        self._min = [None] * len(schema)
+        self._max = [None] * len(schema)
+        self._sum = [0.0] * len(schema)
+        self._count = [0] * len(schema)
+        self._rng = np.random.default_rng(0)
+        self._sample = schema.empty_table()
+        self._sample_keys = np.empty(0)
+
+    def _update_sample(self, table: pa.Table):
+        keys = self._rng.random(table.num_rows)
+        if len(self._sample_keys) >= HISTOGRAM_SAMPLE_ROWS:
+            # Only rows that beat the current worst key can get in
+            entering = keys < self._sample_keys.max()
+            table, keys = table.filter(pa.array(entering)), keys[entering]
+        sample = pa.concat_tables([self._sample, table])
+        sample_keys = np.concatenate([self._sample_keys, keys])
+        if len(sample_keys) > HISTOGRAM_SAMPLE_ROWS:
+            keep = np.argpartition(sample_keys, HISTOGRAM_SAMPLE_ROWS)[:HISTOGRAM_SAMPLE_ROWS]
+            sample, sample_keys = sample.take(keep), sample_keys[keep]
+        self._sample, self._sample_keys = sample, sample_keys
+
+    def update(self, table: pa.Table) -> "ProfileBuilder":
+        self.row_count += table.num_rows
+        self._update_sample(table)
+        for i, field in enumerate(self.schema):
+            col = table.column(i)
+            self._nulls[i] += col.null_count
+
+            if not self._saturated[i]:
+                self._distinct[i].update(pc.unique(col.drop_null()).to_pylist())
+                if len(self._distinct[i]) >= DISTINCT_CAP:
+                    self._saturated[i] = True
+                    self._distinct[i] = set()
+
+            if _is_numeric(field.type):
+                valid = col.drop_null()
+                if len(valid) == 0:
+                    continue
+                min_max = pc.min_max(valid)
+                lo, hi = _finite(min_max["min"].as_py()), _finite(min_max["max"].as_py())
+                if lo is not None:
+                    self._min[i] = lo if self._min[i] is None else min(self._min[i], lo)
+                if hi is not None:
+                    self._max[i] = hi if self._max[i] is None else max(self._max[i], hi)
+                self._sum[i] += float(pc.sum(valid).as_py())
+                self._count[i] += len(valid)
+        return self
+
+    def result(self) -> list[dict]:
+        dtypes = storage.pandas_dtypes(self.schema)
+        profile = []
+        sampled = self.row_count > HISTOGRAM_SAMPLE_ROWS
+        for i, field in enumerate(self.schema):
+            numeric = _is_numeric(field.type)
+            hist = histogram(
+                self._sample.column(i), self.row_count - self._nulls[i],
+                self._min[i] if numeric else None, self._max[i] if numeric else None, sampled,
+            )
+            profile.append({
+                "position": i,
+                "name": field.name,
+                "dtype": dtypes[field.name],
+                "null_count": self._nulls[i],
+                "distinct_count": DISTINCT_CAP if self._saturated[i] else len(self._distinct[i]),
+                "min_value": self._min[i] if numeric else None,
+                "max_value": self._max[i] if numeric else None,
+                "mean": _finite(self._sum[i] / self._count[i]) if numeric and self._count[i] else None,
+                "histogram": histogram_json(hist),
+            })
+        return profile
+
+
+def profile_table(table: pa.Table) -> list[dict]:
+    return ProfileBuilder(table.schema).update(table).result()
+
+
+def histogram_json(hist: dict | None) -> str:
+    """The stored form of a histogram. A column with nothing to count stores "null", not NULL, which means not computed yet."""
+    return json.dumps(hist)
+
+
+def column_histogram(dataset_file: DatasetFile, col: DatasetColumn, row_count: int) -> dict | None:
+    """histogram() for a stored column profiled before histograms existed, from sampled row groups."""
+    sample = storage.sample_column(dataset_file, col.name, HISTOGRAM_SAMPLE_ROWS)
+    return histogram(sample, row_count - (col.null_count or 0), col.min_value, col.max_value, len(sample) < row_count)
+
+
+def profile_rows(dataset_id: int, profile: list[dict]) -> list[DatasetColumn]:
+    return [DatasetColumn(dataset_id=dataset_id, **entry) for entry in profile]
+
+
+def column_to_dict(col: DatasetColumn) -> dict:
+    return {
+        "dtype": col.dtype,
+        "null_count": col.null_count,
+        "distinct_count": col.distinct_count,
+        "min": col.min_value,
+        "max": col.max_value,
+        "mean": col.mean,
+    }
+
+
+def load_profile(db: Session, dataset_id: int) -> list[DatasetColumn]:
+    """Stored profile rows in column order. Raises LookupError if the dataset has no file."""
+    cols = (
+        db.query(DatasetColumn)
+        .filter(DatasetColumn.dataset_id == dataset_id)
+        .order_by(DatasetColumn.position)
+        .all()
+    )
+    if cols:
+        return cols
+
+    # Datasets uploaded before profiling existed: build the profile once and keep it
+    dataset_file = db.query(DatasetFile).filter(DatasetFile.dataset_id == dataset_id).first()
+    if not dataset_file:
+        raise LookupError("Dataset not found")
+    table = storage.read_table(dataset_file)
+
+    cols = profile_rows(dataset_id, profile_table(table))
+    db.add_all(cols)
+    db.query(Dataset).filter(Dataset.id == dataset_id).update({"row_count": table.num_rows})
+    db.commit()
+    return cols
+
+
+async def load_profile_async(db: AsyncSession, dataset_id: int, rebuild: bool = True) -> list[DatasetColumn]:
+    """
+    load_profile() for `async def` endpoints; the legacy rebuild runs on the parse
+    pool. With rebuild=False (a read-only session) a missing profile returns [].
+    """
+    cols = (await db.scalars(
+        select(DatasetColumn).where(DatasetColumn.dataset_id == dataset_id).order_by(DatasetColumn.position)
+    )).all()
+    if cols or not rebuild:
+        return list(cols)
+
+    # Datasets uploaded before profiling existed, as in load_profile()
+    dataset_file = await db.scalar(
+        select(DatasetFile).options(undefer(DatasetFile.data)).where(DatasetFile.dataset_id == dataset_id)
+    )
+    if not dataset_file:
+        raise LookupError("Dataset not found")
+    table = await storage.run_parse(storage.read_table, dataset_file)
+
+    cols = profile_rows(dataset_id, await storage.run_parse(profile_table, table))
+    db.add_all(cols)
+    await db.execute(update(Dataset).where(Dataset.id == dataset_id).values(row_count=table.num_rows))
+    await db.commit()
+    return cols
+
+
+def resolve_features(cols: list[DatasetColumn], target: str, features: list[str]) -> list[str]:
+    """
+    Check target and features against the stored schema without reading any data.
+
+    An empty feature list means every column except the target.
+    """
+    names = [c.name for c in cols]
+    if target not in names:
+        raise ValueError(f"Target '{target}' not found in dataset")
+    if not features:
+        return [n for n in names if n != target]
+    unknown = [f for f in features if f not in names]
+    if unknown:
+        raise ValueError(f"Feature(s) not found in dataset: {', '.join(unknown)}")
+    return list(dict.fromkeys(f for f in features if f != target))
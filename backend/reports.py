@@ -0,0 +1,122 @@
+# backend/reports.py
+"""
+PDF experiment reports.
+
+A report is rendered once per finished (done or failed) experiment and stored
+as the REPORT_ARTIFACT artifact; later downloads are served from the blob
+store. Plot PNGs are downscaled to REPORT_IMAGE_DPI at their printed size and
+re-encoded as JPEG, which reportlab embeds as-is instead of re-compressing
+full-size bitmaps. The PDF is written to a temporary file, never held in
+memory as a whole. Pillow and reportlab are imported with the first report.
+"""
+import io
+import os
+import tempfile
+from typing import TYPE_CHECKING
+
+from backend import plotting, storage
+from backend.instrumentation import is_timing
+from backend.models import Experiment
+
+if TYPE_CHECKING:
+    from reportlab.lib.utils import ImageReader
+
+REPORT_ARTIFACT = "report.pdf"
+REPORT_IMAGE_DPI = int(os.getenv("REPORT_IMAGE_DPI", 150))
+REPORT_JPEG_QUALITY = int(os.getenv("REPORT_JPEG_QUALITY", 85))
+# Box each plot is fitted into, in points
+IMAGE_BOX = (500, 200)
+FINISHED = ("done", "failed")
+
+
+def _report_image(png: bytes) -> tuple["ImageReader", float, float]:
+    """The plot as a JPEG sized for REPORT_IMAGE_DPI, plus its printed width and height in points."""
+    from PIL import Image
+    from reportlab.lib.utils import ImageReader
+
+    img = Image.open(io.BytesIO(png))
+    scale = min(IMAGE_BOX[0] / img.width, IMAGE_BOX[1] / img.height)
+    width, height = img.width * scale, img.height * scale
+    pixels = (round(width / 72 * REPORT_IMAGE_DPI), round(height / 72 * REPORT_IMAGE_DPI))
+    if pixels[0] < img.width:
+        img = img.resize(pixels, Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format="JPEG", quality=REPORT_JPEG_QUALITY, optimize=True)
+    buf.seek(0)
+    return ImageReader(buf), width, height
+
+
+def write_report(exp: Experiment, plots: list[bytes], dest) -> None:
+    """Write the report for `exp` to the binary file object `dest`."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    # invariant: no timestamps or random ids, so the same run gives the same bytes
+    c = canvas.Canvas(dest, pagesize=letter, invariant=True)
+    width, height = letter
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, height - 50, f"Experiment Report - ID {exp.id}")
+
+    c.setFont("Helvetica", 12)
+    c.drawString(50, height - 80, f"Algorithm: {exp.algorithm}")
+    c.drawString(50, height - 100, f"Target: {exp.target}")
+    c.drawString(50, height - 120, f"Created At: {exp.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+    y = height - 140
+    if exp.status != "done":
+        c.drawString(50, y, f"Status: {exp.status}" + (f" ({exp.error})" if exp.error else ""))
+        y -= 20
+
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(50, y - 20, "Metrics:")
+    c.setFont("Helvetica", 12)
+    y -= 40
+    for m in exp.metrics:
+        if is_timing(m.metric_name):
+            continue
+        if y < 50:
+            c.showPage()
+            c.setFont("Helvetica", 12)
+            y = height - 50
+        c.drawString(70, y, f"{m.metric_name}: {m.metric_value:.4f}")
+        y -= 20
+
+    y -= 40
+    for png in plots:
+        img, img_width, img_height = _report_image(png)
+        if y - img_height < 50:
+            c.showPage()
+            y = height - 50
+        c.drawImage(img, 50, y - img_height, width=img_width, height=img_height)
+        y -= img_height + 40
+
+    c.save()
+
+
+def _plots(db, exp: Experiment) -> list[bytes]:
+    if exp.status == "done":
+        plotting.ensure_plots(db, exp)
+        db.refresh(exp)
+    return [storage.artifact_bytes(a) for a in exp.artifacts if a.artifact_path.endswith(".png")]
+
+
+def render_report(db, exp: Experiment) -> bytes:
+    """The report as bytes, for runs that are still in progress and so not cached."""
+    buf = io.BytesIO()
+    write_report(exp, _plots(db, exp), buf)
+    return buf.getvalue()
+
+
+def ensure_report(db, exp: Experiment):
+    """The stored report artifact of a finished run, rendering it on first use; None for unfinished runs."""
+    if exp.status not in FINISHED:
+        return None
+    for a in exp.artifacts:
+        if a.artifact_path == REPORT_ARTIFACT:
+            return a
+    plots = _plots(db, exp)
+    with tempfile.TemporaryFile() as tmp:
+        write_report(exp, plots, tmp)
+        tmp.seek(0)
+        artifact = storage.add_artifact_file(db, exp.id, REPORT_ARTIFACT, tmp)
+    return storage.commit_artifact(db, artifact)
@@ -0,0 +1,96 @@
+# backend/result_cache.py
+"""
+Experiment result cache.
+
+Training is deterministic for a given dataset content and configuration
+(fixed split and estimator seeds), so a finished experiment can answer a
+repeated request. The key hashes the dataset's blob key (its SHA-256) with
+the canonicalized run configuration. A hit clones the earlier experiment's
+metric and artifact rows; artifacts point at the same blobs, so no data is
+copied. Entries expire after RESULT_CACHE_TTL_SECONDS (0 disables the cache).
+"""
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
+
+from backend import reports
+from backend.instrumentation import is_timing
+from backend.models import DatasetFile, Experiment, ExperimentMetric, ExperimentArtifact
+from backend.ml.registry import resolve_params
+
+# Bump when training or plotting changes so old results stop matching
+CACHE_VERSION = 4
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+# Artifacts that show the experiment they were made for (its ID and dates);
+# a clone renders its own on demand instead of inheriting the source's
+PER_EXPERIMENT_ARTIFACTS = {reports.REPORT_ARTIFACT}
+
+hits = 0
+misses = 0
+
+
+def cache_key(
+    dataset_file: DatasetFile,
+    target: str,
+    features: list[str],
+    algorithm: str,
+    split: float,
+    params: dict | None,
+    mode: str = "holdout",
+    search: dict | None = None,
+) -> str | None:
+    """Canonical hash of a run, or None when the dataset has no content hash (legacy rows)."""
+    if not dataset_file.blob_key:
+        return None
+    canonical = {
+        "v": CACHE_VERSION,
+        "dataset": dataset_file.blob_key,
+        "target": target,
+        "features": sorted(set(features) - {target}),
+        "algorithm": algorithm,
+        "split": round(float(split), 6),
+        "params": resolve_params(algorithm, params),
+        "mode": mode,
+        "search": search,
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def find_cached(db: Session, key: str | None) -> Experiment | None:
+    global hits, misses
+    if key is None or RESULT_CACHE_TTL_SECONDS <= 0:
+        return None
+    cutoff = datetime.utcnow() - timedelta(seconds=RESULT_CACHE_TTL_SECONDS)
+    exp = (
+        db.query(Experiment)
+        .options(selectinload(Experiment.metrics), selectinload(Experiment.artifacts))
+        .filter(Experiment.cache_key == key, Experiment.status == "done", Experiment.created_at >= cutoff)
+        .order_by(Experiment.created_at.desc())
+        .first()
+    )
+    if exp is None:
+        misses += 1
+    else:
+        hits += 1
+    return exp
+
+
+def clone_results(db: Session, source: Experiment, target: Experiment):
+    """Copy metric and artifact rows from `source` onto the (flushed) `target` experiment."""
+    # A cache hit did not train, so the source run's timings do not describe it
+    metrics = [
+        {"experiment_id": target.id, "metric_name": m.metric_name, "metric_value": m.metric_value}
+        for m in source.metrics if not is_timing(m.metric_name)
+    ]
+    artifacts = [
+        {"experiment_id": target.id, "artifact_path": a.artifact_path, "blob_key": a.blob_key, "size": a.size}
+        for a in source.artifacts if a.artifact_path not in PER_EXPERIMENT_ARTIFACTS
+    ]
+    if metrics:
+        db.execute(insert(ExperimentMetric), metrics)
+    if artifacts:
+        db.execute(insert(ExperimentArtifact), artifacts)
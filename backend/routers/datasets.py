@@ -1,71 +1,283 @@
 # backend/routers/datasets.py
-from fastapi import APIRouter, UploadFile, Depends, HTTPException
-import pandas as pd
-import io
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, UploadFile, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 from datetime import datetime
+from typing import Optional
+import json
+import math
+import os
+import tempfile
 
-from backend.deps import get_db, get_current_user
-from backend.models import Dataset, DatasetFile
+from backend import storage, profiling
+from backend.blobstore import get_blob_store
+from backend.db import get_async_db, get_async_read_db
+from backend.deps import get_db, get_current_user, get_current_user_async
+from backend.models import Dataset, DatasetFile, DatasetColumn
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
+ROWS_MAX_LIMIT = int(os.getenv("DATASET_ROWS_MAX_LIMIT", 1000))
+
+
+def _upload_size(file: UploadFile) -> int:
+    # Starlette has already spooled the multipart body to a temp file
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+def _convert(src, filename: str, parquet_file, column_types: dict) -> profiling.ProfileBuilder | None:
+    builder = None
+    for batch in storage.convert_upload(src, filename, parquet_file, column_types):
+        if builder is None:
+            builder = profiling.ProfileBuilder(batch.schema)
+        builder.update(batch)
+    return builder
+
+
+def _convert_and_store(src, filename: str):
+    """Blocking part of an upload: CSV/XLSX -> Parquet blob plus profile. None for an empty file."""
+    column_types = {}
+    with tempfile.TemporaryFile() as parquet_file:
+        while True:
+            try:
+                builder = _convert(src, filename, parquet_file, column_types)
+                break
+            except storage.ColumnTypeChanged as e:
+                # Start over with the column widened; each column widens at most twice
+                column_types = e.column_types
+                src.seek(0)
+                parquet_file.seek(0)
+                parquet_file.truncate()
+        if builder is None:
+            return None
+        parquet_file.seek(0)
+        blob_key, size = get_blob_store().put_file(parquet_file)
+    return builder.row_count, builder.result(), blob_key, size
+
 
 @router.post("/upload")
-async def upload_dataset(file: UploadFile, db: Session = Depends(get_db), user=Depends(get_current_user)):
+async def upload_dataset(
+    file: UploadFile, db: AsyncSession = Depends(get_async_db), user=Depends(get_current_user_async)
+):
     """
-    Upload CSV/XLSX file, store it in database, return dataset_id + columns for frontend.
+    Upload CSV/XLSX file, stream it into Parquet while profiling it, return dataset_id + columns for frontend.
+
+    Parsing runs on the bounded parse pool (storage.run_parse) and the rows are
+    written through the async session, so the event loop stays free for other requests.
     """
     try:
-        if file.filename.endswith(".csv"):
-            file_bytes = await file.read()
-            df = pd.read_csv(io.BytesIO(file_bytes))
-        elif file.filename.endswith(".xlsx"):
-            file_bytes = await file.read()
-            df = pd.read_excel(io.BytesIO(file_bytes))
-        else:
-            raise HTTPException(status_code=400, detail="Only CSV/XLSX supported")
-
-        dataset = Dataset(name=file.filename, user_id=user.id, uploaded_at=datetime.utcnow())
-        db.add(dataset)
-        db.commit()
-        db.refresh(dataset)
+        storage.source_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        dataset_file = DatasetFile(dataset_id=dataset.id, filename=file.filename, data=file_bytes)
-        db.add(dataset_file)
-        db.commit()
+    if _upload_size(file) > storage.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {storage.MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit",
+        )
+
+    try:
+        converted = await storage.run_parse(_convert_and_store, file.file, file.filename)
+        if converted is None:
+            raise HTTPException(status_code=400, detail="Dataset is empty")
+        row_count, profile, blob_key, size = converted
 
-        return {"dataset_id": dataset.id, "name": dataset.name, "columns": df.columns.tolist()}
+        # One transaction: the dataset never exists without its profile and file
+        dataset = Dataset(name=file.filename, user_id=user.id, uploaded_at=datetime.utcnow(), row_count=row_count)
+        db.add(dataset)
+        await db.flush()
+        db.add_all(profiling.profile_rows(dataset.id, profile))
+        db.add(DatasetFile(
+            dataset_id=dataset.id,
+            filename=file.filename,
+            format=storage.PARQUET,
+            blob_key=blob_key,
+            size=size,
+        ))
+        await db.commit()
+
+        return {"dataset_id": dataset.id, "name": dataset.name, "columns": [c["name"] for c in profile]}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{dataset_id}/columns")
-def get_columns(dataset_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+async def _load_profile(db: AsyncSession, dataset_id: int, rebuild: bool = True) -> list[DatasetColumn]:
+    try:
+        return await profiling.load_profile_async(db, dataset_id, rebuild)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading dataset: {str(e)}")
+
+
+async def _read_profile(
+    db: AsyncSession, read_db: AsyncSession, dataset_id: int
+) -> tuple[list[DatasetColumn], AsyncSession]:
     """
-    Return only the list of columns (legacy endpoint, still works).
+    The profile, served from the replica when there is one. Only a legacy
+    dataset's first profile rebuild has to write, and that goes to the primary.
+    Returns the session the rows came from, for follow-up reads.
     """
-    dataset_file = db.query(DatasetFile).filter(DatasetFile.dataset_id == dataset_id).first()
+    cols = await _load_profile(read_db, dataset_id, rebuild=False)
+    if cols:
+        return cols, read_db
+    return await _load_profile(db, dataset_id), db
+
+
+async def _dataset_file(db: AsyncSession, dataset_id: int) -> DatasetFile:
+    # `data` only holds bytes for legacy rows; blob-backed rows read the blob store
+    dataset_file = await db.scalar(
+        select(DatasetFile).options(undefer(DatasetFile.data)).where(DatasetFile.dataset_id == dataset_id)
+    )
     if not dataset_file:
         raise HTTPException(status_code=404, detail="Dataset not found")
-    try:
-        df = pd.read_csv(io.BytesIO(dataset_file.data))
-        return {"columns": df.columns.tolist()}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading dataset: {str(e)}")
+    return dataset_file
+
+
+@router.get("/{dataset_id}/columns")
+async def get_columns(
+    dataset_id: int, db: AsyncSession = Depends(get_async_db), user=Depends(get_current_user_async)
+):
+    """
+    Return only the list of columns (legacy endpoint, still works).
+    """
+    return {"columns": [c.name for c in await _load_profile(db, dataset_id)]}
 
 
 @router.get("/{dataset_id}/info")
-def get_dataset_info(dataset_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+async def get_dataset_info(
+    dataset_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+    user=Depends(get_current_user_async),
+):
+    """
+    Return columns, their data types and the upload-time profile for auto-suggesting algorithms.
+    """
+    cols, read_db = await _read_profile(db, read_db, dataset_id)
+    row_count = await read_db.scalar(select(Dataset.row_count).where(Dataset.id == dataset_id))
+    return {
+        "columns": [c.name for c in cols],
+        "dtypes": {c.name: c.dtype for c in cols},
+        "row_count": row_count,
+        "profile": {c.name: profiling.column_to_dict(c) for c in cols},
+    }
+
+
+def _json_rows(table) -> list[dict]:
+    # NaN and infinities are not valid JSON
+    return [
+        {k: None if isinstance(v, float) and not math.isfinite(v) else v for k, v in row.items()}
+        for row in table.to_pylist()
+    ]
+
+
+@router.get("/{dataset_id}/rows")
+async def get_rows(
+    dataset_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=ROWS_MAX_LIMIT),
+    columns: Optional[str] = Query(None, description="Comma-separated column names (default: all)"),
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+    user=Depends(get_current_user_async),
+):
     """
-    Return both columns and their data types for auto-suggesting algorithms.
+    A page of rows. Only the Parquet row groups overlapping the page, and only
+    the requested columns, are decoded, so the cost does not grow with the dataset.
+    """
+    cols, read_db = await _read_profile(db, read_db, dataset_id)
+    names = [c.name for c in cols]
+    if columns:
+        wanted = list(dict.fromkeys(c for c in columns.split(",") if c))
+        unknown = [c for c in wanted if c not in names]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Column(s) not found in dataset: {', '.join(unknown)}")
+        names = wanted
+
+    row_count = await read_db.scalar(select(Dataset.row_count).where(Dataset.id == dataset_id))
+    page = {"offset": offset, "limit": limit, "total_rows": row_count, "columns": names, "rows": []}
+    if row_count is not None and offset >= row_count:
+        return page
+    dataset_file = await _dataset_file(read_db, dataset_id)
+    # Read errors go to the server's error handler; their messages name blob paths
+    table = await storage.run_parse(storage.read_rows, dataset_file, offset, limit, names)
+    page["rows"] = _json_rows(table)
+    return page
+
+
+async def _column(db: AsyncSession, dataset_id: int, name: str) -> DatasetColumn | None:
+    return await db.scalar(
+        select(DatasetColumn)
+        .options(undefer(DatasetColumn.histogram))
+        .where(DatasetColumn.dataset_id == dataset_id, DatasetColumn.name == name)
+    )
+
+
+@router.get("/{dataset_id}/columns/{name}/histogram")
+async def get_column_histogram(
+    dataset_id: int,
+    name: str,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+    user=Depends(get_current_user_async),
+):
+    """
+    Value distribution of one column: equal-width bins for numeric columns, the
+    most frequent values otherwise. Computed at upload from a row sample (see
+    profiling.histogram()); `sampled` says whether counts are scaled estimates.
+    """
+    col = await _column(read_db, dataset_id, name)
+    if col is None:
+        # Legacy datasets get their profile, histograms included, on first use
+        await _load_profile(db, dataset_id)
+        col = await _column(db, dataset_id, name)
+        if col is None:
+            raise HTTPException(status_code=404, detail=f"Column '{name}' not found in dataset")
+
+    if col.histogram is not None:
+        histogram = json.loads(col.histogram)
+    else:
+        # Profiled before histograms were stored: sample a few row groups once and keep the result
+        row_count = await db.scalar(select(Dataset.row_count).where(Dataset.id == dataset_id))
+        dataset_file = await _dataset_file(db, dataset_id)
+        histogram = await storage.run_parse(profiling.column_histogram, dataset_file, col, row_count)
+        await db.execute(
+            update(DatasetColumn).where(DatasetColumn.id == col.id)
+            .values(histogram=profiling.histogram_json(histogram))
+        )
+        await db.commit()
+    return {"column": name, "dtype": col.dtype, "histogram": histogram}
+
+
+@router.get("/{dataset_id}/download")
+def download_dataset(dataset_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """
+    Download the stored dataset file (Parquet for new uploads, the original file for legacy ones).
     """
     dataset_file = db.query(DatasetFile).filter(DatasetFile.dataset_id == dataset_id).first()
     if not dataset_file:
         raise HTTPException(status_code=404, detail="Dataset not found")
-    try:
-        df = pd.read_csv(io.BytesIO(dataset_file.data))
-        dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
-        return {"columns": df.columns.tolist(), "dtypes": dtypes}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading dataset: {str(e)}")
+
+    filename = dataset_file.filename
+    if dataset_file.format == storage.PARQUET:
+        filename = os.path.splitext(filename)[0] + ".parquet"
+
+    if dataset_file.blob_key:
+        return FileResponse(
+            get_blob_store().path(dataset_file.blob_key),
+            media_type="application/vnd.apache.parquet",
+            filename=filename,
+        )
+    return Response(
+        dataset_file.data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -1,28 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Request
+from fastapi.responses import StreamingResponse, FileResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, selectinload
 from datetime import datetime
-import pandas as pd
-import io, base64, os
+from typing import TYPE_CHECKING, Any, Literal, Optional
+import io, base64, os, json, asyncio, hashlib, mimetypes, uuid
+import numpy as np
+import pyarrow.parquet as pq
 from jose import jwt, JWTError
 
-from pydantic import BaseModel
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
+from pydantic import BaseModel, Field
 
-from backend.deps import get_db, get_current_user
-from backend.models import Experiment, ExperimentMetric, ExperimentArtifact, Dataset, DatasetFile
-from backend.ml.pipeline import train_pipeline
+from backend import jobs, storage, profiling, plotting, reports, result_cache
+from backend.instrumentation import split_metrics
+from backend.blobstore import get_blob_store
+from backend.db import SessionLocal
+from backend.deps import get_db, get_read_db, get_current_user
+from backend.models import Experiment, ExperimentArtifact, Dataset, DatasetFile
+from backend.ml.model_cache import MODEL_ARTIFACT, model_cache
 from backend.ml.classification_algorithms import CLASSIFICATION_ALGORITHMS
 from backend.ml.regression_algorithms import REGRESSION_ALGORITHMS
-from backend.ml.plots import (
-    residual_plot, predicted_vs_actual,
-    confusion_matrix_plot, roc_curve_plot
-)
+from backend.ml.registry import ALGORITHMS, HOLDOUT, describe, get_spec, primary_metric
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 router = APIRouter(prefix="/experiments", tags=["experiments"])
 
+STATUS_POLL_SECONDS = float(os.getenv("EXPERIMENT_STATUS_POLL_SECONDS", 1.0))
+
 # ============================
 # Algorithm Info (✅ UPDATED)
 # ============================
@@ -30,8 +37,8 @@ router = APIRouter(prefix="/experiments", tags=["experiments"])
 def get_algorithm_info():
     """Return detailed algorithm descriptions for frontend, separated into groups."""
     return {
-        "classification_algorithms": CLASSIFICATION_ALGORITHMS,
-        "regression_algorithms": REGRESSION_ALGORITHMS
+        "classification_algorithms": describe(CLASSIFICATION_ALGORITHMS),
+        "regression_algorithms": describe(REGRESSION_ALGORITHMS)
     }
 
 
@@ -44,72 +51,240 @@ class RunRequest(BaseModel):
     features: list[str] = []
     split: float = 0.2
     algorithm: str = "linear_regression"
+    params: dict[str, Any] = {}     # estimator hyperparameters, e.g. {"n_estimators": 300, "n_jobs": 4}
+    force: bool = False             # retrain even if an identical run is cached
+    # "holdout" trains once on the split; the others cross-validate on the training part
+    mode: Literal["holdout", "cv", "grid", "random", "halving"] = HOLDOUT
+    cv_folds: int = Field(5, ge=2, le=20)
+    n_iter: int = Field(20, ge=1, le=500)   # candidates sampled in "random" mode
+
+    def search_options(self) -> dict | None:
+        """CV settings stored on the experiment; None for a plain holdout run."""
+        if self.mode == HOLDOUT:
+            return None
+        options = {"cv_folds": self.cv_folds}
+        if self.mode == "random":
+            options["n_iter"] = self.n_iter
+        return options
+
+
+class CompareRequest(BaseModel):
+    dataset_id: int
+    target: str
+    features: list[str] = []
+    split: float = 0.2
+    algorithms: list[str] = []      # explicit list, or
+    type: Optional[Literal["classification", "regression"]] = None   # every algorithm of this type
+    force: bool = False
 
 
 # ============================
 # Run Experiment
 # ============================
-@router.post("/run")
+@router.post("/run", status_code=202)
 def run_experiment(req: RunRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    dataset = db.query(Dataset).filter(Dataset.id == req.dataset_id).first()
-    if not dataset:
-        raise HTTPException(status_code=404, detail="Dataset not found")
+    dataset, dataset_file, features = _validate_run(db, req.dataset_id, req.target, req.features)
+    try:
+        key = result_cache.cache_key(
+            dataset_file, req.target, features, req.algorithm, req.split, req.params,
+            mode=req.mode, search=req.search_options(),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    dataset_file = db.query(DatasetFile).filter(DatasetFile.dataset_id == dataset.id).first()
-    if not dataset_file:
-        raise HTTPException(status_code=404, detail="Dataset file not found")
-
-    df = pd.read_csv(io.BytesIO(dataset_file.data))
-    if req.target not in df.columns:
-        raise HTTPException(status_code=400, detail=f"Target '{req.target}' not found in dataset")
-
-    pipeline, metrics, X_test, y_test, preds = train_pipeline(
-        df, req.target, test_size=req.split, algorithm=req.algorithm
-    )
+    cached = None if req.force else result_cache.find_cached(db, key)
 
     exp = Experiment(
         dataset_id=dataset.id,
         created_at=datetime.utcnow(),
         target=req.target,
-        features=",".join(req.features) if req.features else None,
+        features=",".join(features),
         algorithm=req.algorithm,
-        status="done",
+        params=json.dumps(req.params) if req.params else None,
+        split=req.split,
+        mode=req.mode,
+        search=json.dumps(req.search_options()) if req.search_options() else None,
+        cache_key=key,
+        status="done" if cached else "queued",
     )
     db.add(exp)
+    if cached:
+        db.flush()
+        result_cache.clone_results(db, cached, exp)
     db.commit()
     db.refresh(exp)
 
-    for k, v in metrics.items():
-        db.add(ExperimentMetric(experiment_id=exp.id, metric_name=k, metric_value=v))
+    if not cached:
+        jobs.submit_experiment(exp.id)
+    return {"experiment_id": exp.id, "status": exp.status, "cached": cached is not None}
 
-    if any(x in req.algorithm for x in ["classifier", "logistic", "svm", "knn"]):
-        cm_plot = confusion_matrix_plot(y_test, preds)
-        db.add(ExperimentArtifact(experiment_id=exp.id, artifact_path="confusion_matrix.png", data=cm_plot))
 
-        roc_plot = roc_curve_plot(pipeline, X_test, y_test)
-        if roc_plot:
-            db.add(ExperimentArtifact(experiment_id=exp.id, artifact_path="roc_curve.png", data=roc_plot))
-    else:
-        res_plot = residual_plot(y_test, preds)
-        pva_plot = predicted_vs_actual(y_test, preds)
-        db.add(ExperimentArtifact(experiment_id=exp.id, artifact_path="residual_plot.png", data=res_plot))
-        db.add(ExperimentArtifact(experiment_id=exp.id, artifact_path="predicted_vs_actual.png", data=pva_plot))
+def _validate_run(db: Session, dataset_id: int, target: str, features: list[str]):
+    """Dataset, its file and the resolved feature list; 404/400 on bad input. No data is read."""
+    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    dataset_file = db.query(DatasetFile).filter(DatasetFile.dataset_id == dataset.id).first()
+    if not dataset_file:
+        raise HTTPException(status_code=404, detail="Dataset file not found")
 
+    try:
+        cols = profiling.load_profile(db, dataset.id)
+        return dataset, dataset_file, profiling.resolve_features(cols, target, features)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ============================
+# Compare (one run group, many algorithms)
+# ============================
+@router.post("/compare", status_code=202)
+def compare_experiments(req: CompareRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """
+    One experiment per algorithm, linked by a run group. Runs not served from the
+    result cache train together in a single job that loads, splits and
+    preprocesses the data once; poll /experiments/groups/{run_group} for the leaderboard.
+    """
+    if req.type:
+        algorithms = [name for name, spec in ALGORITHMS.items() if spec["type"] == req.type]
+    else:
+        algorithms = list(dict.fromkeys(req.algorithms))
+    if not algorithms:
+        raise HTTPException(status_code=400, detail="Give a list of algorithms or a type")
+    try:
+        types = {get_spec(a)["type"] for a in algorithms}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(types) > 1:
+        raise HTTPException(status_code=400, detail="Cannot compare classification and regression algorithms")
+
+    dataset, dataset_file, features = _validate_run(db, req.dataset_id, req.target, req.features)
+    run_group = uuid.uuid4().hex
+    runs = []
+    for algorithm in algorithms:
+        key = result_cache.cache_key(dataset_file, req.target, features, algorithm, req.split, None)
+        cached = None if req.force else result_cache.find_cached(db, key)
+        exp = Experiment(
+            dataset_id=dataset.id,
+            created_at=datetime.utcnow(),
+            target=req.target,
+            features=",".join(features),
+            algorithm=algorithm,
+            split=req.split,
+            mode=HOLDOUT,
+            cache_key=key,
+            run_group=run_group,
+            status="done" if cached else "queued",
+        )
+        db.add(exp)
+        db.flush()
+        if cached:
+            result_cache.clone_results(db, cached, exp)
+        runs.append((exp, cached is not None))
     db.commit()
-    return {"experiment_id": exp.id}
+
+    pending = [exp.id for exp, cached in runs if not cached]
+    if pending:
+        jobs.submit_compare(pending)
+    return {
+        "run_group": run_group,
+        "experiments": [
+            {"experiment_id": exp.id, "algorithm": exp.algorithm, "status": exp.status, "cached": cached}
+            for exp, cached in runs
+        ],
+    }
+
+
+@router.get("/groups/{run_group}")
+def get_run_group(run_group: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Leaderboard of a compare run: best primary metric first, unfinished runs last."""
+    exps = (
+        db.query(Experiment)
+        .join(Dataset, Experiment.dataset_id == Dataset.id)
+        .filter(Dataset.user_id == user.id, Experiment.run_group == run_group)
+        .options(selectinload(Experiment.metrics))
+        .all()
+    )
+    if not exps:
+        raise HTTPException(status_code=404, detail="Run group not found")
+
+    ranked_by = primary_metric(exps[0].algorithm)
+    rows = [
+        {
+            "experiment_id": e.id,
+            "algorithm": e.algorithm,
+            "status": e.status,
+            "error": e.error,
+            **dict(zip(("metrics", "timings"), split_metrics(e.metrics))),
+        }
+        for e in exps
+    ]
+    rows.sort(key=lambda r: (ranked_by not in r["metrics"], -r["metrics"].get(ranked_by, 0.0)))
+    return {
+        "run_group": run_group,
+        "ranked_by": ranked_by,
+        "finished": all(e.status in jobs.TERMINAL_STATUSES for e in exps),
+        "leaderboard": rows,
+    }
+
+
+# ============================
+# Experiment Status (polling + SSE)
+# ============================
+def _status_payload(exp: Experiment) -> dict:
+    return {"id": exp.id, "status": exp.status, "error": exp.error}
+
+
+def _fetch_status(experiment_id: int):
+    db = SessionLocal()
+    try:
+        exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        return _status_payload(exp) if exp else None
+    finally:
+        db.close()
+
+
+@router.get("/{experiment_id}/status")
+def get_experiment_status(experiment_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+    if not exp:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    return _status_payload(exp)
+
+
+@router.get("/{experiment_id}/events")
+async def experiment_events(experiment_id: int, user=Depends(get_current_user)):
+    """Server-sent events: one `status` event per change until the job finishes."""
+    first = await run_in_threadpool(_fetch_status, experiment_id)
+    if first is None:
+        raise HTTPException(status_code=404, detail="Experiment not found")
+
+    async def stream():
+        last = None
+        payload = first
+        while True:
+            if payload != last:
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+                last = payload
+            if payload is None or payload["status"] in jobs.TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(STATUS_POLL_SECONDS)
+            payload = await run_in_threadpool(_fetch_status, experiment_id)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 # ============================
 # Get Experiment
 # ============================
 @router.get("/{experiment_id}")
-def get_experiment(experiment_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def get_experiment(experiment_id: int, db: Session = Depends(get_read_db), user=Depends(get_current_user)):
     exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
 
-    metrics = {m.metric_name: m.metric_value for m in exp.metrics}
-    plots = [base64.b64encode(a.data).decode("utf-8") for a in exp.artifacts]
+    metrics, timings = split_metrics(exp.metrics)
 
     return {
         "id": exp.id,
@@ -117,28 +292,233 @@ def get_experiment(experiment_id: int, db: Session = Depends(get_db), user=Depen
         "target": exp.target,
         "features": exp.features.split(",") if exp.features else [],
         "algorithm": exp.algorithm,
+        "run_group": exp.run_group,
+        "params": json.loads(exp.params) if exp.params else {},
+        "mode": exp.mode or HOLDOUT,
+        "search": json.loads(exp.search) if exp.search else None,
         "status": exp.status,
+        "error": exp.error,
         "metrics": metrics,
-        "plots": plots,
+        # Seconds per stage of the run, plus its peak_rss_mb (see backend/instrumentation.py)
+        "timings": timings,
+        "artifacts": [_artifact_out(exp.id, a) for a in exp.artifacts],
+        "plots": [
+            {"name": name, "url": f"/experiments/{exp.id}/artifacts/{name}"} for name in plotting.available_plots(exp)
+        ],
+        "plot_data_url": f"/experiments/{exp.id}/plot-data" if plotting.has_predictions(exp) else None,
     }
 
 
+# ============================
+# Artifacts
+# ============================
+ARTIFACT_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _artifact_out(experiment_id: int, a: ExperimentArtifact) -> dict:
+    return {
+        "name": a.artifact_path,
+        "content_type": mimetypes.guess_type(a.artifact_path)[0] or "application/octet-stream",
+        "size": a.size,
+        "url": f"/experiments/{experiment_id}/artifacts/{a.artifact_path}",
+    }
+
+
+@router.get("/{experiment_id}/artifacts")
+def list_artifacts(experiment_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    if not db.query(Experiment.id).filter(Experiment.id == experiment_id).first():
+        raise HTTPException(status_code=404, detail="Experiment not found")
+    artifacts = (
+        db.query(ExperimentArtifact)
+        .filter(ExperimentArtifact.experiment_id == experiment_id)
+        .order_by(ExperimentArtifact.id)
+        .all()
+    )
+    return [_artifact_out(experiment_id, a) for a in artifacts]
+
+
+@router.get("/{experiment_id}/artifacts/{name}")
+def get_artifact(
+    experiment_id: int,
+    name: str,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Raw artifact bytes. Content never changes once written, so it is cacheable forever."""
+    artifact = (
+        db.query(ExperimentArtifact)
+        .filter(ExperimentArtifact.experiment_id == experiment_id, ExperimentArtifact.artifact_path == name)
+        .first()
+    )
+    if not artifact:
+        # Plots are derived after the run finishes; produce this one now if it is still pending
+        exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        if exp and exp.status == "done" and name in plotting.derived_names(exp.algorithm):
+            artifact = plotting.ensure_plots(db, exp, [name])[name]
+    if not artifact:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    data = None
+    if artifact.blob_key:
+        etag = f'"{artifact.blob_key}"'
+    else:
+        data = artifact.data
+        etag = f'"{hashlib.sha256(data).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": ARTIFACT_CACHE_CONTROL}
+
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if data is not None:
+        return Response(data, media_type=media_type, headers=headers)
+    return FileResponse(get_blob_store().path(artifact.blob_key), media_type=media_type, headers=headers)
+
+
+@router.get("/{experiment_id}/plot-data")
+def get_plot_data(
+    experiment_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Binned data behind the run's plots as JSON ({plot name: data}), for
+    clients that draw their own charts. 404 for runs without stored predictions.
+    """
+    return get_artifact(experiment_id, plotting.PLOT_DATA_ARTIFACT, if_none_match, db, user)
+
+
 # ============================
 # List Experiments
 # ============================
+def _encode_cursor(exp: Experiment) -> str:
+    raw = f"{exp.created_at.isoformat()}|{exp.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, exp_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(exp_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("")
-def list_experiments(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    exps = db.query(Experiment).order_by(Experiment.created_at.desc()).all()
-    return [
-        {
-            "id": e.id,
-            "created_at": e.created_at.isoformat(),
-            "target": e.target,
-            "status": e.status,
-            "metrics": {m.metric_name: m.metric_value for m in e.metrics}
-        }
-        for e in exps
+def list_experiments(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    dataset_id: Optional[int] = None,
+    algorithm: Optional[str] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    """Newest first, keyset-paginated on (created_at, id) and scoped to the caller's datasets."""
+    q = (
+        db.query(Experiment)
+        .join(Dataset, Experiment.dataset_id == Dataset.id)
+        .filter(Dataset.user_id == user.id)
+        .options(selectinload(Experiment.metrics))
+    )
+    if dataset_id is not None:
+        q = q.filter(Experiment.dataset_id == dataset_id)
+    if algorithm:
+        q = q.filter(Experiment.algorithm == algorithm)
+    if status:
+        q = q.filter(Experiment.status == status)
+    if cursor:
+        q = q.filter(tuple_(Experiment.created_at, Experiment.id) < _decode_cursor(cursor))
+
+    exps = q.order_by(Experiment.created_at.desc(), Experiment.id.desc()).limit(limit + 1).all()
+    page = exps[:limit]
+    return {
+        "items": [
+            {
+                "id": e.id,
+                "created_at": e.created_at.isoformat(),
+                "dataset_id": e.dataset_id,
+                "target": e.target,
+                "algorithm": e.algorithm,
+                "run_group": e.run_group,
+                "status": e.status,
+                "metrics": split_metrics(e.metrics)[0],
+            }
+            for e in page
+        ],
+        "next_cursor": _encode_cursor(page[-1]) if len(exps) > limit else None,
+    }
+
+
+# ============================
+# Predict
+# ============================
+PREDICT_BATCH_SIZE = int(os.getenv("PREDICT_BATCH_SIZE", 10_000))
+
+
+def _parse_predict_body(body: bytes, content_type: str) -> "pd.DataFrame":
+    import pandas as pd
+
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        return pd.read_csv(io.BytesIO(body))
+    if content_type in ("application/vnd.apache.parquet", "application/x-parquet"):
+        return pq.read_table(io.BytesIO(body)).to_pandas()
+    if content_type in ("application/json", ""):
+        payload = json.loads(body or b"[]")
+        rows = payload.get("rows", []) if isinstance(payload, dict) else payload
+        return pd.DataFrame.from_records(rows)
+    raise HTTPException(status_code=415, detail=f"Unsupported content type '{content_type}'")
+
+
+def _predict(experiment_id: int, X: "pd.DataFrame", db: Session) -> list:
+    artifact = (
+        db.query(ExperimentArtifact)
+        .filter(ExperimentArtifact.experiment_id == experiment_id, ExperimentArtifact.artifact_path == MODEL_ARTIFACT)
+        .first()
+    )
+    if not artifact:
+        raise HTTPException(status_code=404, detail="No saved model for this experiment")
+
+    pipeline = model_cache.get(artifact.blob_key)
+    expected = list(getattr(pipeline, "feature_names_in_", X.columns))
+    missing = [c for c in expected if c not in X.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing columns: {', '.join(missing)}")
+    X = X[expected]
+
+    preds = [
+        pipeline.predict(X.iloc[start:start + PREDICT_BATCH_SIZE])
+        for start in range(0, len(X), PREDICT_BATCH_SIZE)
     ]
+    return np.concatenate(preds).tolist() if preds else []
+
+
+@router.post("/{experiment_id}/predict")
+async def predict(
+    experiment_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Score rows with the experiment's saved model.
+
+    Body: JSON (`{"rows": [{...}, ...]}` or a bare list), CSV (`text/csv`) or Parquet
+    (`application/vnd.apache.parquet`). Rows are predicted in vectorized batches.
+    """
+    body = await request.body()
+    try:
+        X = await storage.run_parse(_parse_predict_body, body, request.headers.get("content-type", ""))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse request body: {str(e)}")
+
+    predictions = await run_in_threadpool(_predict, experiment_id, X, db)
+    return {"experiment_id": experiment_id, "count": len(predictions), "predictions": predictions}
 
 
 # ============================
@@ -162,44 +542,19 @@ def download_experiment_pdf(
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
 
-    metrics = {m.metric_name: m.metric_value for m in exp.metrics}
-    plots = [a.data for a in exp.artifacts]
-
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, height - 50, f"Experiment Report - ID {exp.id}")
-
-    c.setFont("Helvetica", 12)
-    c.drawString(50, height - 80, f"Algorithm: {exp.algorithm}")
-    c.drawString(50, height - 100, f"Target: {exp.target}")
-    c.drawString(50, height - 120, f"Created At: {exp.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
-
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, height - 160, "Metrics:")
-    c.setFont("Helvetica", 12)
-    y = height - 180
-    for k, v in metrics.items():
-        c.drawString(70, y, f"{k}: {v:.4f}")
-        y -= 20
-
-    y -= 40
-    for plot_bytes in plots:
-        img = ImageReader(io.BytesIO(plot_bytes))
-        img_height = 200
-        if y - img_height < 50:
-            c.showPage()
-            y = height - 50
-        c.drawImage(img, 50, y - img_height, width=500, height=img_height, preserveAspectRatio=True, mask="auto")
-        y -= img_height + 40
-
-    c.save()
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
+    filename = f"experiment_{exp.id}.pdf"
+    artifact = reports.ensure_report(db, exp)
+    if artifact is None:
+        # Still queued or running: nothing final to cache yet
+        return Response(
+            reports.render_report(db, exp),
+            media_type="application/pdf",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+    # FileResponse answers Range requests, so interrupted downloads can resume
+    return FileResponse(
+        get_blob_store().path(artifact.blob_key),
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=experiment_{exp.id}.pdf"}
+        filename=filename,
+        headers={"ETag": f'"{artifact.blob_key}"', "Cache-Control": ARTIFACT_CACHE_CONTROL},
     )
@@ -0,0 +1,71 @@
+# backend/routers/metrics.py
+"""
+Prometheus scrape endpoint.
+
+Besides the histograms in backend/instrumentation.py, each scrape reads the
+live state of the job queue, the result, model and auth caches and the database
+connection pools (labelled by engine). Counters are per API process; with several server workers,
+scrape each one (or aggregate by instance label).
+"""
+import os
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from backend import jobs, result_cache
+from backend import db
+from backend.deps import principal_cache
+from backend.instrumentation import REGISTRY
+from backend.ml.model_cache import model_cache
+
+router = APIRouter(tags=["metrics"])
+
+# When set, scrapes must send "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Engines by role; without a replica the read sessions use the primary's engines.
+# The pools themselves are looked up per scrape, since dispose() replaces them.
+ENGINES = {"primary": db.engine, "primary_async": db.async_engine.sync_engine}
+if db.DATABASE_READ_URL:
+    ENGINES.update(read=db.read_engine, read_async=db.async_read_engine.sync_engine)
+
+
+class _StateCollector:
+    def collect(self):
+        yield GaugeMetricFamily("experiment_queue_depth", "Experiment jobs submitted and not finished", value=jobs.queue_depth())
+
+        for name, hits, misses in (
+            ("result_cache", result_cache.hits, result_cache.misses),
+            ("model_cache", model_cache.hits, model_cache.misses),
+            ("auth_cache", principal_cache.hits, principal_cache.misses),
+        ):
+            requests = CounterMetricFamily(f"{name}_requests", f"{name} lookups by outcome", labels=["outcome"])
+            requests.add_metric(["hit"], hits)
+            requests.add_metric(["miss"], misses)
+            yield requests
+        yield GaugeMetricFamily("model_cache_bytes", "Estimated size of the cached models", value=model_cache.size_bytes())
+
+        pool_stats = GaugeMetricFamily(
+            "db_pool_connections", "Database pool connections by engine and state", labels=["engine", "state"]
+        )
+        pool_size = GaugeMetricFamily("db_pool_size", "Configured database pool size by engine", labels=["engine"])
+        for name, engine in ENGINES.items():
+            pool = engine.pool
+            for state, attr in (("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow")):
+                if hasattr(pool, attr):
+                    pool_stats.add_metric([name, state], getattr(pool, attr)())
+            if hasattr(pool, "size"):
+                pool_size.add_metric([name], pool.size())
+        yield pool_stats
+        yield pool_size
+
+
+REGISTRY.register(_StateCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: str | None = Header(None)):
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
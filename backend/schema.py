@@ -0,0 +1,88 @@
+# backend/schema.py
+"""
+Database schema management.
+
+Alembic owns the schema; the app never creates tables itself. An existing
+database is brought up to date with `alembic upgrade head` (run in backend/).
+The first migration expects the tables that predate it, so an empty database
+is instead created from the models and stamped at the head revision:
+
+    python -m backend.schema init     # empty database -> current schema
+    python -m backend.schema check    # exit 1 unless at the head revision
+
+The API checks the revision at startup and on GET /ready (see check()).
+"""
+import argparse
+import os
+import sys
+from functools import cache
+
+from sqlalchemy import inspect
+
+from backend.db import Base, engine
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SchemaNotReady(RuntimeError):
+    pass
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    # Independent of the working directory
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+
+@cache
+def head_revision() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision() -> str | None:
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def check() -> str:
+    """The database's revision; raises SchemaNotReady unless it is the migration head."""
+    current, head = current_revision(), head_revision()
+    if current != head:
+        hint = "python -m backend.schema init" if current is None else "alembic upgrade head"
+        raise SchemaNotReady(f"Database schema is at {current or 'no revision'}, expected {head}; run `{hint}`")
+    return current
+
+
+def init():
+    """Create the current schema in an empty database and stamp it at the head revision."""
+    from alembic import command
+    from backend import models  # noqa: F401
+
+    if inspect(engine).get_table_names():
+        raise SchemaNotReady("Database is not empty; use `alembic upgrade head` for existing databases")
+    Base.metadata.create_all(bind=engine)
+    command.stamp(alembic_config(), "head")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=("init", "check"))
+    args = parser.parse_args()
+    try:
+        if args.action == "init":
+            init()
+        print(f"Database schema at {check()}")
+    except SchemaNotReady as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# backend/storage.py
+"""
+Dataset storage.
+
+Uploads are parsed once at ingest and stored as Parquet in the blob store, so
+later reads can memory-map the file and project just the columns they need.
+Older rows may still hold Parquet or the raw CSV/XLSX bytes in the database;
+those are read through the same functions.
+"""
+import asyncio
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from sqlalchemy.exc import IntegrityError
+
+from backend.blobstore import get_blob_store
+from backend.models import DatasetFile, ExperimentArtifact
+
+if TYPE_CHECKING:
+    # Imported where used: pandas is only needed for XLSX and legacy rows and for training
+    import pandas as pd
+
+PARQUET = "parquet"
+SUPPORTED_UPLOADS = (".csv", ".xlsx")
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", 1024)) * 1024 * 1024
+CSV_BLOCK_SIZE = int(os.getenv("CSV_BLOCK_SIZE_MB", 16)) * 1024 * 1024
+# Rows per Parquet row group: the unit read_rows() decodes for a page of rows
+PARQUET_ROW_GROUP_ROWS = int(os.getenv("PARQUET_ROW_GROUP_ROWS", 65_536))
+# Threads for parsing request payloads (uploads, prediction bodies); bounded so a
+# burst of large uploads queues instead of starving the server's shared threadpool
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+
+_parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+
+async def run_parse(fn, *args):
+    """Run blocking parse/convert work on the parse pool and await the result off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_parse_executor, fn, *args)
+
+
+def source_format(filename: str) -> str:
+    """Return 'csv' or 'xlsx' for a supported upload, otherwise raise ValueError."""
+    name = filename.lower()
+    for ext in SUPPORTED_UPLOADS:
+        if name.endswith(ext):
+            return ext[1:]
+    raise ValueError("Only CSV/XLSX supported")
+
+
+def _normalized_schema(schema: pa.Schema) -> pa.Schema:
+    # pandas.read_csv never parsed dates, so keep them as strings for the pipeline
+    return pa.schema([
+        f.with_type(pa.string()) if pa.types.is_temporal(f.type) else f for f in schema
+    ])
+
+
+def _normalize(table: pa.Table) -> pa.Table:
+    schema = _normalized_schema(table.schema)
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+
+class ColumnTypeChanged(ValueError):
+    """
+    A later CSV block held a value that does not fit the type Arrow inferred
+    from the first block. `column_types` has that column widened; convert the
+    upload again from the start with it.
+    """
+
+    def __init__(self, message: str, column_types: dict[str, pa.DataType]):
+        super().__init__(message)
+        self.column_types = column_types
+
+
+_CSV_COLUMN_ERROR = re.compile(r"In CSV column #(\d+):")
+
+
+def _widened(dtype: pa.DataType) -> pa.DataType:
+    # The order pandas.read_csv would settle on: all-empty -> float -> anything goes as a string
+    if pa.types.is_null(dtype) or pa.types.is_integer(dtype):
+        return pa.float64()
+    return pa.string()
+
+
+def _iter_csv(src: BinaryIO, column_types: dict[str, pa.DataType]) -> Iterator[pa.Table]:
+    reader = pa_csv.open_csv(
+        src,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+    )
+    while True:
+        try:
+            batch = reader.read_next_batch()
+        except StopIteration:
+            return
+        except pa.ArrowInvalid as e:
+            # Types are inferred from the first block only, so a column that is
+            # all ints (or empty) there and holds 1.5 later fails here
+            match = _CSV_COLUMN_ERROR.search(str(e))
+            if not match:
+                raise
+            field = reader.schema.field(int(match.group(1)))
+            raise ColumnTypeChanged(str(e), {**column_types, field.name: _widened(field.type)}) from e
+        yield pa.Table.from_batches([batch])
+
+
+def _iter_source(src: BinaryIO, filename: str, column_types: dict[str, pa.DataType]) -> Iterator[pa.Table]:
+    if source_format(filename) == "csv":
+        yield from _iter_csv(src, column_types)
+    else:
+        # openpyxl cannot stream; XLSX uploads are bounded by MAX_UPLOAD_BYTES instead
+        import pandas as pd
+        yield pa.Table.from_pandas(pd.read_excel(src), preserve_index=False)
+
+
+def convert_upload(
+    src: BinaryIO, filename: str, dest: BinaryIO, column_types: dict[str, pa.DataType] | None = None
+) -> Iterator[pa.Table]:
+    """
+    Stream an uploaded CSV/XLSX into Parquet written to `dest`.
+
+    Yields each converted batch after it has been written, so the caller can
+    profile it in the same pass. Memory stays at roughly one CSV block.
+    `column_types` overrides the inferred type of CSV columns; raises
+    ColumnTypeChanged when a column has to be widened mid-file.
+    """
+    writer = None
+    try:
+        for table in _iter_source(src, filename, column_types or {}):
+            table = _normalize(table)
+            if writer is None:
+                writer = pq.ParquetWriter(dest, table.schema, compression="zstd")
+            writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_ROWS)
+            yield table
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _is_parquet(dataset_file: DatasetFile) -> bool:
+    return dataset_file.format == PARQUET
+
+
+def _parquet_source(dataset_file: DatasetFile):
+    if dataset_file.blob_key:
+        return get_blob_store().path(dataset_file.blob_key)
+    return io.BytesIO(dataset_file.data)
+
+
+def read_schema(dataset_file: DatasetFile) -> pa.Schema:
+    """Column names and types, reading only the Parquet footer when possible."""
+    if _is_parquet(dataset_file):
+        return pq.read_schema(_parquet_source(dataset_file))
+    return pa.Schema.from_pandas(read_dataset(dataset_file), preserve_index=False)
+
+
+def pandas_dtypes(schema: pa.Schema) -> dict:
+    """Map column name -> pandas dtype name, as the frontend expects."""
+    return {col: str(dtype) for col, dtype in schema.empty_table().to_pandas().dtypes.items()}
+
+
+def read_table(dataset_file: DatasetFile, columns: list[str] | None = None) -> pa.Table:
+    if _is_parquet(dataset_file):
+        return pq.read_table(_parquet_source(dataset_file), columns=columns, memory_map=True)
+    return pa.Table.from_pandas(read_dataset(dataset_file, columns), preserve_index=False)
+
+
+def _row_groups(parquet: pq.ParquetFile) -> list[tuple[int, int]]:
+    """(first row, row count) of each row group, from the footer alone."""
+    groups, start = [], 0
+    for i in range(parquet.num_row_groups):
+        rows = parquet.metadata.row_group(i).num_rows
+        groups.append((start, rows))
+        start += rows
+    return groups
+
+
+def read_rows(dataset_file: DatasetFile, offset: int, limit: int, columns: list[str] | None = None) -> pa.Table:
+    """Rows [offset, offset + limit), decoding only the row groups (and columns) that hold them."""
+    if not _is_parquet(dataset_file):
+        return read_table(dataset_file, columns).slice(offset, limit)
+
+    parquet = pq.ParquetFile(_parquet_source(dataset_file), memory_map=True)
+    wanted = [
+        (i, start) for i, (start, rows) in enumerate(_row_groups(parquet))
+        if start < offset + limit and start + rows > offset
+    ]
+    if not wanted:
+        empty = parquet.schema_arrow.empty_table()
+        return empty.select(columns) if columns else empty
+    table = parquet.read_row_groups([i for i, _ in wanted], columns=columns)
+    return table.slice(offset - wanted[0][1], limit)
+
+
+def sample_column(dataset_file: DatasetFile, name: str, max_rows: int) -> pa.ChunkedArray:
+    """
+    About `max_rows` values of one column, from row groups spread evenly over
+    the file, so a sample of a huge dataset decodes only a few row groups.
+    """
+    if not _is_parquet(dataset_file):
+        return read_table(dataset_file, [name]).column(0)
+
+    parquet = pq.ParquetFile(_parquet_source(dataset_file), memory_map=True)
+    total = parquet.metadata.num_rows
+    # Every step-th group: a file 4x over max_rows reads a quarter of its groups
+    step = max(1, round(total / max_rows))
+    picked = list(range(0, parquet.num_row_groups, step))
+    return parquet.read_row_groups(picked, columns=[name]).column(0)
+
+
+def read_dataset(dataset_file: DatasetFile, columns: list[str] | None = None) -> "pd.DataFrame":
+    """Load a stored dataset, optionally only the given columns."""
+    if _is_parquet(dataset_file):
+        return read_table(dataset_file, columns).to_pandas()
+
+    # Legacy rows: raw upload bytes
+    import pandas as pd
+    if source_format(dataset_file.filename) == "xlsx":
+        df = pd.read_excel(io.BytesIO(dataset_file.data))
+    else:
+        df = pd.read_csv(io.BytesIO(dataset_file.data), usecols=columns)
+    return df[columns] if columns else df
+
+
+def iter_batches(
+    dataset_file: DatasetFile, columns: list[str] | None = None, batch_size: int = 100_000
+) -> Iterator["pd.DataFrame"]:
+    """Stream a stored dataset as DataFrames of at most `batch_size` rows."""
+    if _is_parquet(dataset_file):
+        parquet = pq.ParquetFile(_parquet_source(dataset_file), memory_map=True)
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    df = read_dataset(dataset_file, columns)
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+def artifact_row(experiment_id: int, name: str, data: bytes) -> dict:
+    """Write `data` to the blob store; returns its artifact row's values for a bulk insert."""
+    blob_key, size = get_blob_store().put_bytes(data)
+    return {"experiment_id": experiment_id, "artifact_path": name, "blob_key": blob_key, "size": size}
+
+
+def add_artifact(db, experiment_id: int, name: str, data: bytes) -> ExperimentArtifact:
+    """Write `data` to the blob store and add (not commit) its artifact row."""
+    artifact = ExperimentArtifact(**artifact_row(experiment_id, name, data))
+    db.add(artifact)
+    return artifact
+
+
+def add_artifact_file(db, experiment_id: int, name: str, src: BinaryIO) -> ExperimentArtifact:
+    """add_artifact() for content in a file, copied to the blob store in chunks."""
+    blob_key, size = get_blob_store().put_file(src)
+    artifact = ExperimentArtifact(experiment_id=experiment_id, artifact_path=name, blob_key=blob_key, size=size)
+    db.add(artifact)
+    return artifact
+
+
+def commit_artifact(db, artifact: ExperimentArtifact) -> ExperimentArtifact:
+    """
+    Commit a just-added artifact row. When a concurrent request stored the same
+    name first, the unique (experiment_id, artifact_path) index rejects this
+    one; return the stored row instead.
+    """
+    try:
+        db.commit()
+        return artifact
+    except IntegrityError:
+        db.rollback()
+        return db.query(ExperimentArtifact).filter(
+            ExperimentArtifact.experiment_id == artifact.experiment_id,
+            ExperimentArtifact.artifact_path == artifact.artifact_path,
+        ).one()
+
+
+def artifact_bytes(artifact: ExperimentArtifact) -> bytes:
+    if artifact.blob_key:
+        return get_blob_store().read_bytes(artifact.blob_key)
+    return artifact.data
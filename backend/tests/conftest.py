@@ -0,0 +1,20 @@
+import os
+import tempfile
+
+import pytest
+
+# backend.db and the blob store read these at import; keep tests off any real database or blob dir
+_TMP = tempfile.mkdtemp(prefix="regression-app-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TMP, 'test.db')}")
+os.environ.setdefault("BLOB_DIR", os.path.join(_TMP, "blobs"))
+
+
+@pytest.fixture
+def db():
+    from backend import models  # noqa: F401
+    from backend.db import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
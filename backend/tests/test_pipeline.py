@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.ml.pipeline import train_many, train_pipeline
+
+
+def _frame(rows: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=rows)
+    return pd.DataFrame({
+        "x": x,
+        "cat": rng.choice(["a", "b", "c"], size=rows),
+        "y": 3 * x + rng.normal(scale=0.5, size=rows),
+    })
+
+
+@pytest.mark.parametrize("max_rows", [None, 300])
+def test_compare_member_matches_single_run(max_rows):
+    df = _frame()
+    plans = {
+        "sampled": {"algorithm": "ridge_regression", "params": None, "max_rows": max_rows},
+        "full": {"algorithm": "ridge_regression", "params": None, "max_rows": None},
+    }
+    results, _, _ = train_many(df, "y", plans)
+    _, metrics, _ = results["sampled"]
+
+    _, expected, _, _, _ = train_pipeline(df, "y", algorithm="ridge_regression", max_rows=max_rows)
+    model_metrics = {k: v for k, v in metrics.items() if not k.startswith("timing.")}
+    assert model_metrics == pytest.approx(expected)
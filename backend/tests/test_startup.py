@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+from backend.benchmarks.common import PROJECT_DIR
+from backend.benchmarks.startup import DEFAULT_FORBIDDEN, DEFAULT_IMPORT_BUDGET
+
+
+def _import_app() -> dict[str, int]:
+    """Cumulative import time in microseconds per module loaded by `import backend.app` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.app"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_stays_light():
+    # Best of three, so a busy machine does not fail the budget
+    runs = [_import_app() for _ in range(3)]
+    seconds = min(run["backend.app"] for run in runs) / 1e6
+    assert seconds <= DEFAULT_IMPORT_BUDGET, f"import backend.app took {seconds:.2f}s"
+
+    loaded = {name.split(".")[0] for name in runs[0]}
+    assert not loaded & set(DEFAULT_FORBIDDEN.split(","))
@@ -0,0 +1,60 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from backend import storage
+from backend.db import SessionLocal
+from backend.models import Experiment, ExperimentArtifact
+from backend.routers import datasets
+
+BLOCK_SIZE = 64 * 1024
+ROWS = 20_000   # several blocks of BLOCK_SIZE
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(storage, "CSV_BLOCK_SIZE", BLOCK_SIZE)
+
+
+def _csv(late: str) -> bytes:
+    # Column a is an int and b is empty for the whole first block; both change on the last row
+    rows = "".join(f"{i},,x{i}\n" for i in range(ROWS))
+    return f"a,b,c\n{rows}{late},{late},last\n".encode()
+
+
+def test_csv_column_type_is_inferred_from_first_block():
+    with pytest.raises(storage.ColumnTypeChanged) as e:
+        list(storage.convert_upload(io.BytesIO(_csv("1.5")), "data.csv", io.BytesIO()))
+    assert e.value.column_types == {"a": pa.float64()}
+
+
+@pytest.mark.parametrize("late, expected", [("1.5", pa.float64()), ("abc", pa.string())])
+def test_upload_widens_columns_that_change_after_first_block(late, expected):
+    src = io.BytesIO(_csv(late))
+    row_count, profile, blob_key, size = datasets._convert_and_store(src, "data.csv")
+
+    assert row_count == ROWS + 1
+    table = pq.read_table(storage.get_blob_store().path(blob_key))
+    assert table.schema.field("a").type == expected
+    assert table.schema.field("b").type == expected
+    assert table.column("a")[-1].as_py() == (1.5 if late == "1.5" else late)
+    assert table.column("b").null_count == ROWS
+    assert table.column("c").to_pylist()[:2] == ["x0", "x1"]
+    assert [c["name"] for c in profile] == ["a", "b", "c"]
+
+
+def test_commit_artifact_keeps_the_row_a_concurrent_request_stored(db):
+    exp = Experiment(algorithm="linear_regression", status="done")
+    db.add(exp)
+    db.commit()
+
+    other = SessionLocal()
+    first_id = storage.commit_artifact(other, storage.add_artifact(other, exp.id, "residual_plot.png", b"first")).id
+    other.close()
+
+    artifact = storage.commit_artifact(db, storage.add_artifact(db, exp.id, "residual_plot.png", b"second"))
+    assert artifact.id == first_id
+    assert storage.artifact_bytes(artifact) == b"first"
+    assert db.query(ExperimentArtifact).filter(ExperimentArtifact.experiment_id == exp.id).count() == 1
@@ -0,0 +1,53 @@
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend import worker
+from backend.ml import strategy
+from backend.models import Dataset, DatasetFile, Experiment, User
+
+ROWS = 20_000
+SLOW_ALGORITHMS = ["random_forest_regressor", "gradient_boosting_regressor", "random_forest_regressor", "ridge_regression"]
+
+
+def _dataset(db) -> int:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"x{i}": rng.normal(size=ROWS) for i in range(8)})
+    df["y"] = df.sum(axis=1) + rng.normal(size=ROWS)
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buf)
+
+    user = User(email=f"worker-{time.time_ns()}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    dataset = Dataset(name="data.csv", user_id=user.id, row_count=ROWS)
+    db.add(dataset)
+    db.flush()
+    db.add(DatasetFile(dataset_id=dataset.id, filename="data.csv", format="parquet", data=buf.getvalue()))
+    db.commit()
+    return dataset.id
+
+
+def test_compare_group_stops_at_its_time_budget(db, monkeypatch):
+    dataset_id = _dataset(db)
+    exps = [Experiment(dataset_id=dataset_id, target="y", algorithm=a, split=0.2, status="queued") for a in SLOW_ALGORITHMS]
+    db.add_all(exps)
+    db.commit()
+    ids = [e.id for e in exps]
+    # The group's budget is this times its size
+    monkeypatch.setattr(strategy, "EXPERIMENT_TIME_BUDGET_SECONDS", 0.1)
+
+    start = time.perf_counter()
+    worker.run_compare_job(ids)
+    elapsed = time.perf_counter() - start
+
+    db.expire_all()
+    for exp in db.query(Experiment).filter(Experiment.id.in_(ids)):
+        assert exp.status == "failed"
+        assert "time budget" in exp.error
+    # Unbudgeted, the forests and boosting alone take several times longer
+    assert elapsed < 10
@@ -0,0 +1,280 @@
+# backend/worker.py
+"""
+Experiment jobs, run inside the pool processes started by backend/jobs.py.
+
+Loads the dataset, trains and writes the results; plot data is derived after
+the run is marked done (see backend/plotting.py). Each stage of a job is timed
+into `timing.*` metric rows (backend/instrumentation.py). The API process never
+imports this module, so the training stack stays out of its startup.
+"""
+import json
+import logging
+
+from sqlalchemy import insert
+
+from backend import storage, profiling, plotting, instrumentation
+from backend.db import SessionLocal
+from backend.instrumentation import stage
+from backend.models import Experiment, ExperimentMetric, ExperimentArtifact, Dataset, DatasetFile
+from backend.ml.pipeline import train_pipeline, train_many
+from backend.ml import strategy
+from backend.ml.search import search_pipeline
+from backend.ml.registry import HOLDOUT, is_classification
+from backend.ml.model_cache import MODEL_ARTIFACT, serialize_model
+from backend.ml.plots import positive_scores
+
+logger = logging.getLogger(__name__)
+
+BEST_PARAMS_ARTIFACT = "best_params.json"
+STRATEGY_ARTIFACT = "strategy.json"
+
+
+def run_experiment_job(experiment_id: int):
+    """Train one queued experiment. Runs inside a pool worker process."""
+    db = SessionLocal()
+    try:
+        exp = db.query(Experiment).filter(Experiment.id == experiment_id).first()
+        if not exp:
+            return
+        exp.status = "running"
+        db.commit()
+
+        job_peak = instrumentation.reset_peak_rss()
+        with instrumentation.trace() as timer:
+            try:
+                with strategy.time_budget(strategy.EXPERIMENT_TIME_BUDGET_SECONDS):
+                    _train_and_store(db, exp)
+                exp.status = "done"
+                with stage("commit"):
+                    db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.exception("Experiment %s failed", experiment_id)
+                exp.status = "failed"
+                exp.error = str(e)
+                db.commit()
+            else:
+                _render_plot_data(db, exp)
+        # Failed runs keep their timings too; they show where the time went
+        _store_timings(db, exp, job_peak, timer)
+    finally:
+        db.close()
+
+
+def _load_inputs(db, exp: Experiment):
+    """The experiment's dataset file, row count and the keyword arguments shared by every training entry point."""
+    dataset_file = db.query(DatasetFile).filter(DatasetFile.dataset_id == exp.dataset_id).first()
+    if not dataset_file:
+        raise ValueError("Dataset file not found")
+
+    features = exp.features.split(",") if exp.features else []
+    row_count = db.query(Dataset.row_count).filter(Dataset.id == exp.dataset_id).scalar()
+    options = dict(
+        features=features or None, test_size=exp.split or 0.2,
+        cardinality={c.name: c.distinct_count for c in profiling.load_profile(db, exp.dataset_id)},
+    )
+    return dataset_file, row_count, options
+
+
+def _read_frame(dataset_file: DatasetFile, exp: Experiment):
+    # Features were checked against the stored schema at enqueue time; read only
+    # those columns plus the target
+    features = exp.features.split(",") if exp.features else []
+    return storage.read_dataset(dataset_file, columns=features + [exp.target] if features else None)
+
+
+def _train_and_store(db, exp: Experiment):
+    with stage("load_inputs"):
+        dataset_file, row_count, options = _load_inputs(db, exp)
+    plan = strategy.plan(exp.algorithm, row_count, json.loads(exp.params) if exp.params else None)
+    options.update(algorithm=plan["algorithm"], params=plan["params"])
+    mode = exp.mode or HOLDOUT
+
+    if mode == HOLDOUT and plan["stream"]:
+        pipeline, metrics, X_test, y_test, preds = strategy.train_incremental(
+            dataset_file, exp.target, row_count=row_count, **options
+        )
+        _store_results(db, exp, pipeline, metrics, X_test, y_test, preds, plan)
+        return
+
+    with stage("read"):
+        df = _read_frame(dataset_file, exp)
+    options["max_rows"] = plan["max_rows"]
+    if mode == HOLDOUT:
+        pipeline, metrics, X_test, y_test, preds = train_pipeline(df, exp.target, **options)
+        _store_results(db, exp, pipeline, metrics, X_test, y_test, preds, plan)
+        return
+
+    pipeline, metrics, X_test, y_test, preds, search = search_pipeline(
+        df, exp.target, mode, **options, **(json.loads(exp.search) if exp.search else {})
+    )
+    metrics = {**metrics, **search["metrics"]}
+    # Numeric winners are also metric rows; the JSON artifact has all of them
+    for k, v in search["best_params"].items():
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            metrics[f"best.{k}"] = float(v)
+    extra = {BEST_PARAMS_ARTIFACT: json.dumps(search["best_params"], indent=2).encode()} if search["best_params"] else {}
+    _store_results(db, exp, pipeline, metrics, X_test, y_test, preds, plan, extra)
+
+
+def run_compare_job(experiment_ids: list[int]):
+    """
+    Train a compare group: experiments on the same dataset, target, features and
+    split that differ only in algorithm. The data is read and split once for the
+    members trained in memory; see _train_group(). Each experiment still
+    finishes or fails on its own.
+    """
+    db = SessionLocal()
+    try:
+        exps = db.query(Experiment).filter(Experiment.id.in_(experiment_ids)).order_by(Experiment.id).all()
+        if not exps:
+            return
+        for exp in exps:
+            exp.status = "running"
+        db.commit()
+
+        # One process trains the whole group, so members share its peak
+        job_peak = instrumentation.reset_peak_rss()
+        # Stages shared by the group are recorded on every member; each model's
+        # own fit/predict timings come back with its metrics from train_many()
+        with instrumentation.trace() as group_timer:
+            try:
+                with stage("load_inputs"):
+                    dataset_file, row_count, options = _load_inputs(db, exps[0])
+                plans = {exp.id: strategy.plan(exp.algorithm, row_count) for exp in exps}
+                with strategy.time_budget(strategy.EXPERIMENT_TIME_BUDGET_SECONDS * len(exps)):
+                    results = _train_group(dataset_file, exps[0], row_count, plans, options)
+            except Exception as e:
+                db.rollback()
+                logger.exception("Compare group %s failed", experiment_ids)
+                for exp in exps:
+                    exp.status = "failed"
+                    exp.error = str(e)
+                db.commit()
+                for exp in exps:
+                    _store_timings(db, exp, job_peak, group_timer)
+                return
+
+        timers = {}
+        for exp in exps:
+            with instrumentation.trace() as timers[exp.id]:
+                try:
+                    result = results[exp.id]
+                    if isinstance(result, Exception):
+                        raise result
+                    _store_results(db, exp, *result, plans[exp.id])
+                    exp.status = "done"
+                    with stage("commit"):
+                        db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.exception("Experiment %s failed", exp.id)
+                    exp.status = "failed"
+                    exp.error = str(e)
+                    db.commit()
+
+        for exp in exps:
+            if exp.status == "done":
+                with instrumentation.trace() as timer:
+                    _render_plot_data(db, exp)
+                timers[exp.id].durations.update(timer.durations)
+            _store_timings(db, exp, job_peak, group_timer, timers[exp.id])
+    finally:
+        db.close()
+
+
+def _train_group(dataset_file, exp: Experiment, row_count, plans: dict, options: dict) -> dict:
+    """
+    {experiment id: train_pipeline()'s tuple or the exception raised} for a
+    compare group. Members are trained the way a single run of the same plan
+    would be (so they share its cache key): streamed plans one by one with
+    train_incremental(), the rest together by train_many() on one read of the data.
+    """
+    results = {}
+    in_memory = {key: plan for key, plan in plans.items() if not plan["stream"]}
+    if in_memory:
+        with stage("read"):
+            df = _read_frame(dataset_file, exp)
+        trained, X_test, y_test = train_many(df, exp.target, in_memory, **options)
+        del df   # before any streamed member starts
+        for key, result in trained.items():
+            if not isinstance(result, Exception):
+                pipeline, metrics, preds = result
+                result = (pipeline, metrics, X_test, y_test, preds)
+            results[key] = result
+
+    for key, plan in plans.items():
+        if not plan["stream"]:
+            continue
+        # Its own trace, as train_many() does per model
+        try:
+            with instrumentation.trace() as timer:
+                result = strategy.train_incremental(
+                    dataset_file, exp.target, algorithm=plan["algorithm"], params=plan["params"],
+                    row_count=row_count, **options
+                )
+            result[1].update(timer.metrics())
+            results[key] = result
+        except strategy.TimeBudgetExceeded:
+            raise
+        except Exception as e:
+            results[key] = e
+    return results
+
+
+def _store_results(db, exp: Experiment, pipeline, metrics: dict, X_test, y_test, preds, plan: dict, extra_artifacts=None):
+    """
+    Write the blobs, then every metric and artifact row as one bulk insert each.
+    Nothing is committed here: the caller commits the rows together with the
+    status change, so a run is either fully stored or not at all.
+    """
+    with stage("serialize"):
+        model_bytes = serialize_model(pipeline)
+    with stage("store"):
+        report = {**plan, "train_rows": metrics.get("sample.train_rows"), "sample_fraction": metrics.get("sample.fraction")}
+        # Plot data and PNGs are derived from the predictions after the run is committed; see _render_plot_data()
+        scores, pos_label = positive_scores(pipeline, X_test) if is_classification(exp.algorithm) else (None, None)
+        artifacts = {
+            MODEL_ARTIFACT: model_bytes,
+            STRATEGY_ARTIFACT: json.dumps(report, indent=2).encode(),
+            plotting.PREDICTIONS_ARTIFACT: plotting.predictions_bytes(y_test, preds, scores, pos_label),
+            **(extra_artifacts or {}),
+        }
+        _insert_metrics(db, exp.id, metrics)
+        db.execute(insert(ExperimentArtifact), [storage.artifact_row(exp.id, k, v) for k, v in artifacts.items()])
+
+
+def _insert_metrics(db, experiment_id: int, metrics: dict):
+    if metrics:
+        db.execute(insert(ExperimentMetric), [
+            {"experiment_id": experiment_id, "metric_name": k, "metric_value": v} for k, v in metrics.items()
+        ])
+
+
+def _render_plot_data(db, exp: Experiment):
+    """Background stage: the run is already done; a failure here is logged, not fatal. PNGs are rendered on demand."""
+    try:
+        with stage("plot_data"):
+            plotting.ensure_plots(db, exp, [plotting.PLOT_DATA_ARTIFACT])
+    except Exception:
+        db.rollback()
+        logger.exception("Computing plot data for experiment %s failed", exp.id)
+
+
+def _store_timings(db, exp: Experiment, job_peak: bool, *timers):
+    """
+    Write the timers' stages and the peak RSS as timing.* metric rows; best
+    effort. `job_peak` says whether the peak was reset when the job started;
+    if not, it is the worker's lifetime peak and stored under a name that says so.
+    """
+    timings = {}
+    for timer in timers:
+        timings.update(timer.metrics())
+    peak_name = "peak_rss_mb" if job_peak else "worker_peak_rss_mb"
+    timings[f"{instrumentation.TIMING_PREFIX}{peak_name}"] = instrumentation.peak_rss_mb()
+    try:
+        _insert_metrics(db, exp.id, timings)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Storing timings for experiment %s failed", exp.id)
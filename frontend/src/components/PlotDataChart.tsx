@@ -0,0 +1,176 @@
+// Draws the binned plot data from /experiments/{id}/plot-data as plain SVG.
+// The server only sends bin counts, so the payload stays small regardless of
+// how many test rows the run had.
+
+export type PlotData =
+  | { kind: "histogram"; x_label: string; edges: number[]; counts: number[] }
+  | {
+      kind: "hist2d";
+      x_label: string;
+      y_label: string;
+      x_edges: number[];
+      y_edges: number[];
+      counts: number[][];
+    }
+  | { kind: "confusion_matrix"; labels: string[]; matrix: number[][] }
+  | { kind: "roc"; fpr: number[]; tpr: number[]; auc: number };
+
+const W = 400;
+const H = 300;
+const PAD = 40;
+const PLOT_W = W - 2 * PAD;
+const PLOT_H = H - 2 * PAD;
+
+const fmt = (v: number) => (Math.abs(v) >= 1000 || (v !== 0 && Math.abs(v) < 0.01) ? v.toExponential(1) : v.toFixed(2));
+
+function Axes({ xLabel, yLabel, xRange, yRange }: {
+  xLabel: string;
+  yLabel: string;
+  xRange?: [number, number];
+  yRange?: [number, number];
+}) {
+  return (
+    <g className="text-slate-500" fontSize={10} fill="currentColor">
+      <line x1={PAD} y1={H - PAD} x2={W - PAD} y2={H - PAD} stroke="currentColor" />
+      <line x1={PAD} y1={PAD} x2={PAD} y2={H - PAD} stroke="currentColor" />
+      <text x={W / 2} y={H - 8} textAnchor="middle">{xLabel}</text>
+      <text x={12} y={H / 2} textAnchor="middle" transform={`rotate(-90 12 ${H / 2})`}>{yLabel}</text>
+      {xRange && (
+        <>
+          <text x={PAD} y={H - PAD + 12} textAnchor="start">{fmt(xRange[0])}</text>
+          <text x={W - PAD} y={H - PAD + 12} textAnchor="end">{fmt(xRange[1])}</text>
+        </>
+      )}
+      {yRange && (
+        <>
+          <text x={PAD - 4} y={H - PAD} textAnchor="end">{fmt(yRange[0])}</text>
+          <text x={PAD - 4} y={PAD + 8} textAnchor="end">{fmt(yRange[1])}</text>
+        </>
+      )}
+    </g>
+  );
+}
+
+function Histogram({ edges, counts, x_label }: Extract<PlotData, { kind: "histogram" }>) {
+  const max = Math.max(1, ...counts);
+  const bw = PLOT_W / counts.length;
+  return (
+    <>
+      {counts.map((c, i) => (
+        <rect
+          key={i}
+          x={PAD + i * bw}
+          y={H - PAD - (c / max) * PLOT_H}
+          width={Math.max(bw - 1, 1)}
+          height={(c / max) * PLOT_H}
+          className="fill-blue-500"
+        />
+      ))}
+      <Axes xLabel={x_label} yLabel="Count" xRange={[edges[0], edges[edges.length - 1]]} yRange={[0, max]} />
+    </>
+  );
+}
+
+function Hist2d({ x_edges, y_edges, counts, x_label, y_label }: Extract<PlotData, { kind: "hist2d" }>) {
+  // Log-scaled opacity, like the server's hexbin plot
+  const max = Math.log1p(Math.max(1, ...counts.flat()));
+  const cw = PLOT_W / counts.length;
+  const ch = PLOT_H / (counts[0]?.length || 1);
+  return (
+    <>
+      {counts.flatMap((row, i) =>
+        row.map((c, j) =>
+          c > 0 ? (
+            <rect
+              key={`${i}-${j}`}
+              x={PAD + i * cw}
+              y={H - PAD - (j + 1) * ch}
+              width={cw}
+              height={ch}
+              className="fill-blue-600"
+              fillOpacity={0.15 + 0.85 * (Math.log1p(c) / max)}
+            />
+          ) : null
+        )
+      )}
+      <line x1={PAD} y1={H - PAD} x2={W - PAD} y2={PAD} stroke="grey" strokeDasharray="4 3" />
+      <Axes
+        xLabel={x_label}
+        yLabel={y_label}
+        xRange={[x_edges[0], x_edges[x_edges.length - 1]]}
+        yRange={[y_edges[0], y_edges[y_edges.length - 1]]}
+      />
+    </>
+  );
+}
+
+function ConfusionMatrix({ labels, matrix }: Extract<PlotData, { kind: "confusion_matrix" }>) {
+  const max = Math.max(1, ...matrix.flat());
+  const n = labels.length;
+  const size = Math.min(PLOT_W, PLOT_H) / n;
+  return (
+    <g fontSize={Math.max(8, Math.min(14, size / 3))}>
+      {matrix.flatMap((row, i) =>
+        row.map((v, j) => (
+          <g key={`${i}-${j}`}>
+            <rect
+              x={PAD + j * size}
+              y={PAD + i * size}
+              width={size}
+              height={size}
+              className="fill-blue-600"
+              fillOpacity={0.08 + 0.92 * (v / max)}
+              stroke="white"
+            />
+            <text
+              x={PAD + (j + 0.5) * size}
+              y={PAD + (i + 0.5) * size}
+              textAnchor="middle"
+              dominantBaseline="middle"
+              fill={v > max / 2 ? "white" : "black"}
+            >
+              {v}
+            </text>
+          </g>
+        ))
+      )}
+      {labels.map((l, k) => (
+        <g key={l} fontSize={10} className="text-slate-500" fill="currentColor">
+          <text x={PAD + (k + 0.5) * size} y={PAD - 6} textAnchor="middle">{l}</text>
+          <text x={PAD - 6} y={PAD + (k + 0.5) * size} textAnchor="end" dominantBaseline="middle">{l}</text>
+        </g>
+      ))}
+      <g fontSize={10} className="text-slate-500" fill="currentColor">
+        <text x={PAD + (n * size) / 2} y={PAD + n * size + 16} textAnchor="middle">Predicted label</text>
+        <text x={W - 8} y={PAD + (n * size) / 2} textAnchor="middle" transform={`rotate(90 ${W - 8} ${PAD + (n * size) / 2})`}>
+          True label
+        </text>
+      </g>
+    </g>
+  );
+}
+
+function Roc({ fpr, tpr, auc }: Extract<PlotData, { kind: "roc" }>) {
+  const points = fpr.map((x, i) => `${PAD + x * PLOT_W},${H - PAD - tpr[i] * PLOT_H}`).join(" ");
+  return (
+    <>
+      <line x1={PAD} y1={H - PAD} x2={W - PAD} y2={PAD} stroke="grey" strokeDasharray="4 3" />
+      <polyline points={points} fill="none" className="stroke-blue-500" strokeWidth={2} />
+      <text x={W - PAD - 4} y={H - PAD - 8} textAnchor="end" fontSize={12} className="fill-slate-600">
+        AUC = {auc.toFixed(3)}
+      </text>
+      <Axes xLabel="False Positive Rate" yLabel="True Positive Rate" xRange={[0, 1]} yRange={[0, 1]} />
+    </>
+  );
+}
+
+export default function PlotDataChart({ data }: { data: PlotData }) {
+  return (
+    <svg viewBox={`0 0 ${W} ${H}`} className="w-full h-auto" role="img">
+      {data.kind === "histogram" && <Histogram {...data} />}
+      {data.kind === "hist2d" && <Hist2d {...data} />}
+      {data.kind === "confusion_matrix" && <ConfusionMatrix {...data} />}
+      {data.kind === "roc" && <Roc {...data} />}
+    </svg>
+  );
+}
@@ -20,7 +20,7 @@ export default function RunHistoryTable({ rows }: { rows: ExperimentItem[] }) {
             const statusColor =
               r.status === "failed"
                 ? "bg-red-500"
-                : r.status === "running"
+                : r.status === "running" || r.status === "queued"
                 ? "bg-yellow-500"
                 : "bg-green-500";
 
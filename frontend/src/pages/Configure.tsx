@@ -6,6 +6,7 @@ import { motion } from "framer-motion";
 export default function Configure() {
   const [columns, setColumns] = useState<string[]>([]);
   const [dtypes, setDtypes] = useState<Record<string, string>>({});
+  const [profile, setProfile] = useState<Record<string, { distinct_count?: number | null }>>({});
   const [target, setTarget] = useState("");
   const [features, setFeatures] = useState<string[]>([]);
   const [split, setSplit] = useState(0.2);
@@ -28,17 +29,26 @@ export default function Configure() {
         if (Array.isArray(res.data?.columns)) {
           setColumns(res.data.columns);
           setDtypes(res.data.dtypes || {});
+          setProfile(res.data.profile || {});
         }
       } catch {}
     };
     fetchInfo();
   }, [datasetId]);
 
-  // Auto-select recommended algorithm based on dtype
+  // Text/boolean targets, or integer targets with only a few distinct values, are classes
+  const looksCategorical = (col: string) => {
+    const dtype = dtypes[col];
+    if (!dtype) return false;
+    if (["object", "category", "str", "string", "bool"].includes(dtype)) return true;
+    const distinct = profile[col]?.distinct_count;
+    return dtype.startsWith("int") && distinct != null && distinct <= 10;
+  };
+
+  // Auto-select recommended algorithm based on dtype and profile
   useEffect(() => {
     if (target && dtypes[target]) {
-      const dtype = dtypes[target];
-      if (dtype === "object" || dtype === "category") {
+      if (looksCategorical(target)) {
         setAlgorithm("random_forest_classifier");
         setRecommended("random_forest_classifier");
       } else {
@@ -46,7 +56,7 @@ export default function Configure() {
         setRecommended("linear_regression");
       }
     }
-  }, [target, dtypes]);
+  }, [target, dtypes, profile]);
 
   // Fetch algorithm info from backend
   useEffect(() => {
@@ -60,8 +70,7 @@ export default function Configure() {
   }, []);
 
   // Determine which algorithms to display based on target dtype
-  const isClassification =
-    target && (dtypes[target] === "object" || dtypes[target] === "category");
+  const isClassification = target && looksCategorical(target);
 
   const availableAlgorithms = isClassification
     ? Object.keys(algoInfo.classification_algorithms || {})
@@ -7,14 +7,21 @@ import { Clock } from "lucide-react";
 
 export default function History() {
   const [rows, setRows] = useState<ExperimentItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
+  const fetchPage = async (cursor?: string) => {
+    const res = await api.get("/experiments", { params: cursor ? { cursor } : {} });
+    setRows((prev) => (cursor ? [...prev, ...(res.data?.items || [])] : res.data?.items || []));
+    setNextCursor(res.data?.next_cursor ?? null);
+  };
+
   useEffect(() => {
     const load = async () => {
       try {
-        const res = await api.get("/experiments");
-        setRows(res.data || []);
+        await fetchPage();
       } catch (err: any) {
         setError(err?.response?.data?.detail || "❌ Failed to fetch history.");
       } finally {
@@ -24,6 +31,18 @@ export default function History() {
     load();
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      await fetchPage(nextCursor);
+    } catch (err: any) {
+      setError(err?.response?.data?.detail || "❌ Failed to fetch history.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   return (
     <motion.div
       className="grid gap-6 animate-fadeIn"
@@ -53,6 +72,13 @@ export default function History() {
           <div className="overflow-x-auto">
             <RunHistoryTable rows={rows} />
           </div>
+          {nextCursor && (
+            <div className="flex justify-center p-4">
+              <button className="btn-primary hover-scale" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </motion.div>
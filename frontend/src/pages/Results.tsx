@@ -2,32 +2,85 @@ import { useEffect, useState } from "react";
 import { useParams } from "react-router-dom";
 import api from "@/api";
 import MetricCards from "@/components/MetricCards";
+import PlotDataChart, { PlotData } from "@/components/PlotDataChart";
 import { ExperimentMetrics } from "@/types";
 import { motion } from "framer-motion";
 import { FileDown } from "lucide-react";
 
+type Plot = { name: string; url: string };
+
+const PLOT_TITLES: Record<string, string> = {
+  residual_plot: "Residual Plot",
+  predicted_vs_actual: "Predicted vs Actual",
+  confusion_matrix: "Confusion Matrix",
+  roc_curve: "ROC Curve",
+};
+
+const plotTitle = (name: string) => {
+  const key = name.replace(/\.[^.]+$/, "");
+  return PLOT_TITLES[key] ?? key.replace(/_/g, " ");
+};
+
+// Plots are separate cacheable resources; fetch them in parallel with the auth header.
+// They may still be rendering when the run finishes (the server renders on demand),
+// and a plot that does not apply (e.g. ROC for multiclass) is simply skipped.
+async function loadPlots(plots: Plot[]) {
+  const results = await Promise.allSettled(
+    plots.map(async (p) => {
+      const res = await api.get(p.url, { responseType: "blob" });
+      return { name: p.name, src: URL.createObjectURL(res.data) };
+    })
+  );
+  return results.flatMap((r) => (r.status === "fulfilled" ? [r.value] : []));
+}
+
+// Binned plot data is drawn client-side; runs that predate it fall back to the PNGs.
+async function loadPlotData(url: string | null) {
+  if (!url) return null;
+  try {
+    const res = await api.get<Record<string, PlotData>>(url);
+    return Object.entries(res.data).map(([name, data]) => ({ name, data }));
+  } catch {
+    return null;
+  }
+}
+
 export default function Results() {
   const { id } = useParams();
   const [metrics, setMetrics] = useState<ExperimentMetrics | undefined>();
-  const [plots, setPlots] = useState<string[]>([]);
+  const [plots, setPlots] = useState<{ name: string; src: string }[]>([]);
+  const [charts, setCharts] = useState<{ name: string; data: PlotData }[] | null>(null);
   const [algorithm, setAlgorithm] = useState<string>("");
+  const [status, setStatus] = useState<string>("");
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
+    let timer: ReturnType<typeof setTimeout> | undefined;
     const load = async () => {
       try {
         const res = await api.get(`/experiments/${id}`);
-        setMetrics(res.data.metrics);
-        setPlots(res.data.plots || []);
+        setStatus(res.data.status);
         setAlgorithm(res.data.algorithm);
+        if (res.data.status === "failed") {
+          setError(res.data.error || "❌ Experiment failed");
+        } else if (res.data.status === "queued" || res.data.status === "running") {
+          // Training runs in the background; poll until it finishes
+          timer = setTimeout(load, 1500);
+          return;
+        } else {
+          setMetrics(res.data.metrics);
+          const data = await loadPlotData(res.data.plot_data_url);
+          if (data) setCharts(data);
+          else setPlots(await loadPlots(res.data.plots || []));
+        }
       } catch (err: any) {
         setError(err?.response?.data?.detail || "❌ Failed to fetch results");
-      } finally {
-        setLoading(false);
       }
+      setLoading(false);
     };
     if (id) load();
+    return () => clearTimeout(timer);
   }, [id]);
 
   const downloadPDF = async () => {
@@ -76,7 +129,9 @@ export default function Results() {
 
       {loading ? (
         <div className="glass backdrop-blur-lg p-6 shadow-md rounded-2xl text-center">
-          Loading results...
+          {status === "queued" || status === "running"
+            ? `Experiment ${status}...`
+            : "Loading results..."}
         </div>
       ) : error ? (
         <div className="glass backdrop-blur-lg p-6 shadow-md rounded-2xl text-red-600">
@@ -93,31 +148,35 @@ export default function Results() {
 
           {/* Plots Section */}
           <div className="grid md:grid-cols-2 gap-6">
-            {plots.length > 0 ? (
-              plots.map((b64, i) => (
+            {charts && charts.length > 0 ? (
+              charts.map((chart, i) => (
+                <motion.div
+                  key={chart.name}
+                  className="glass backdrop-blur-lg p-4 rounded-2xl shadow-md hover-scale"
+                  initial={{ opacity: 0, y: 15 }}
+                  animate={{ opacity: 1, y: 0 }}
+                  transition={{ delay: i * 0.1 }}
+                >
+                  <h3 className="text-lg font-semibold mb-3 text-primary">{plotTitle(chart.name)}</h3>
+                  <PlotDataChart data={chart.data} />
+                </motion.div>
+              ))
+            ) : plots.length > 0 ? (
+              plots.map((plot, i) => (
                 <motion.div
-                  key={i}
+                  key={plot.name}
                   className="glass backdrop-blur-lg p-4 rounded-2xl shadow-md hover-scale"
                   initial={{ opacity: 0, y: 15 }}
                   animate={{ opacity: 1, y: 0 }}
                   transition={{ delay: i * 0.1 }}
                 >
                   <h3 className="text-lg font-semibold mb-3 text-primary">
-                    {algorithm.includes("classifier") ||
-                    algorithm.includes("logistic") ||
-                    algorithm.includes("svm") ||
-                    algorithm.includes("knn")
-                      ? i === 0
-                        ? "Confusion Matrix"
-                        : "ROC Curve"
-                      : i === 0
-                      ? "Residual Plot"
-                      : "Predicted vs Actual"}
+                    {plotTitle(plot.name)}
                   </h3>
                   <img
-                    alt={`Plot ${i + 1}`}
+                    alt={plot.name}
                     className="w-full rounded-xl shadow-sm"
-                    src={`data:image/png;base64,${b64}`}
+                    src={plot.src}
                   />
                 </motion.div>
               ))
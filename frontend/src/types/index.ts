@@ -9,7 +9,15 @@ export type ExperimentMetrics = {
 export type ExperimentItem = {
   id: string;
   created_at?: string;
+  dataset_id?: number;
   target?: string;
+  algorithm?: string;
+  run_group?: string | null;
   status?: string;
   metrics?: ExperimentMetrics;
 };
+
+export type ExperimentPage = {
+  items: ExperimentItem[];
+  next_cursor: string | null;
+};